@@ -2,9 +2,13 @@
 OCR processing module using Tesseract for text extraction
 """
 
+import functools
 import logging
 import os
-import tempfile
+
+# One small region per call: OpenMP thread start-up in tesseract costs more
+# than it saves, and the engine pool already runs several OCR calls at once.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
 
 import cv2
 import numpy as np
@@ -14,6 +18,31 @@ from pytesseract import Output
 
 logger = logging.getLogger(__name__)
 
+# Tesseract command that passed the sanity check, shared by all processors
+_tesseract_cmd = None
+
+# Known names drawn into the synthetic self-test image, with their positions
+_TEST_NAMES = (
+    ("John Smith", (50, 50)),
+    ("Jane Doe", (50, 100)),
+    ("Bob Johnson", (200, 50)),
+    ("Alice Brown", (200, 100)),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _synthetic_names_image() -> Image.Image:
+    """Render _TEST_NAMES once; the inputs are constant so the image is too."""
+    img = Image.new('RGB', (400, 200), 'white')
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.truetype("arial.ttf", 24)
+    except Exception:
+        font = ImageFont.load_default()
+    for txt, pos in _TEST_NAMES:
+        draw.text(pos, txt, fill='black', font=font)
+    return img
+
 
 class OCRProcessor:
     """Handles OCR text extraction with position information"""
@@ -23,7 +52,14 @@ class OCRProcessor:
         self.setup_tesseract()
 
     def setup_tesseract(self):
-        """Locate and configure the Tesseract OCR executable."""
+        """Locate and configure the Tesseract OCR executable.
+
+        The probe runs once per process; later instances reuse its result.
+        """
+        global _tesseract_cmd
+        if _tesseract_cmd is not None:
+            pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
+            return
         possible_paths = [
             r'C:\Program Files\Tesseract-OCR\tesseract.exe',
             r'C:\Program Files (x86)\Tesseract-OCR\tesseract.exe',
@@ -33,9 +69,9 @@ class OCRProcessor:
             try:
                 if os.path.exists(path) or path == 'tesseract':
                     pytesseract.pytesseract.tesseract_cmd = path
-                    # quick sanity check
-                    img = Image.new('RGB', (10, 10), 'white')
-                    pytesseract.image_to_string(img)
+                    # quick sanity check (no OCR run needed)
+                    pytesseract.get_tesseract_version()
+                    _tesseract_cmd = path
                     logger.info(f"Tesseract found at: {path}")
                     return
             except Exception:
@@ -84,19 +120,19 @@ class OCRProcessor:
 
         entries = []
         n = len(data['text'])
-        for i in range(n):
-            conf = float(data['conf'][i] or -1)
-            txt = data['text'][i].strip()
-            if conf < self.min_confidence or len(txt) < 2 or txt.isdigit():
+        blocks = data.get('block_num') or [0] * n
+        pars = data.get('par_num') or [0] * n
+        for txt, conf, x, y, w, h, block, par in zip(
+                data['text'], data['conf'], data['left'], data['top'],
+                data['width'], data['height'], blocks, pars):
+            conf = float(conf or -1)
+            if conf < self.min_confidence or w < 10 or h < 8:
                 continue
-            x, y, w, h = (data['left'][i], data['top'][i],
-                          data['width'][i], data['height'][i])
-            if w < 10 or h < 8:
+            txt = txt.strip()
+            if len(txt) < 2 or txt.isdigit():
                 continue
             entries.append({
-                'text': txt,
-                'block': data.get('block_num', [0]*n)[i],
-                'par': data.get('par_num', [0]*n)[i],
+                'text': txt, 'block': block, 'par': par,
                 'x': x, 'y': y, 'width': w, 'height': h, 'conf': conf
             })
 
@@ -128,7 +164,7 @@ class OCRProcessor:
                 'confidence': sum(confs)/len(confs)
             })
 
-        logger.info(f"OCR extracted {len(results)} names")
+        logger.info("OCR extracted %d names", len(results))
         return results
 
     def test_extract(self) -> bool:
@@ -136,24 +172,10 @@ class OCRProcessor:
         Synthetic unit test: draw known names, run extract, assert grouping.
         """
         try:
-            img = Image.new('RGB', (400, 200), 'white')
-            draw = ImageDraw.Draw(img)
-            try:
-                font = ImageFont.truetype("arial.ttf", 24)
-            except Exception:
-                font = ImageFont.load_default()
-            test_names = [
-                ("John Smith", (50, 50)),
-                ("Jane Doe", (50, 100)),
-                ("Bob Johnson", (200, 50)),
-                ("Alice Brown", (200, 100))
-            ]
-            for txt, pos in test_names:
-                draw.text(pos, txt, fill='black', font=font)
-            results = self.extract_text_with_positions(img)
+            results = self.extract_text_with_positions(_synthetic_names_image())
             names = {r['name'] for r in results}
             # expect all four full names
-            success = set([n for n, _ in test_names]).issubset(names)
+            success = {n for n, _ in _TEST_NAMES}.issubset(names)
             if success:
                 logger.info("test_extract passed")
             else:
@@ -4,9 +4,11 @@
 Screen capture, change detection, OCR, scrolling, and duplicate management
 """
 
+import hashlib
 import logging
+import threading
+from datetime import datetime
 from typing import Optional, Tuple, List, Dict
-import imagehash
 import pyautogui
 from PIL import Image
 from core.ocr_processor import OCRProcessor
@@ -14,9 +16,19 @@ from tracker.duplicate_tracker import DuplicateTracker
 from core.scroll_tracker import ScrollTracker
 from gui.overlay_window import OverlayWindow
 from tracker.database import Database
+from utils.image_utils import fast_phash
+
+try:
+    import mss
+except ImportError:  # optional: fall back to PyAutoGUI capture
+    mss = None
 
 logger = logging.getLogger(__name__)
 
+# Pixel stride of the cheap fingerprint checked before pHash
+FINGERPRINT_STRIDE = 16
+
+
 class ScreenCapture:
     """Handles periodic region capture, change detection, OCR, and duplicate highlighting."""
 
@@ -27,7 +39,8 @@ class ScreenCapture:
             scroll_threshold: int = 10
     ):
         self.region: Optional[Tuple[int,int,int,int]] = region
-        self.last_hash: Optional[imagehash.ImageHash] = None
+        self.last_hash: Optional[int] = None
+        self._last_fp: Optional[bytes] = None
         self.hash_threshold = hash_threshold
 
         # Core helpers
@@ -42,11 +55,13 @@ class ScreenCapture:
             scroll_threshold=scroll_threshold
         )
 
+        # mss handles are tied to the thread that opened them
+        self._sct_local = threading.local()
+
         # Disable PyAutoGUI failsafe
         pyautogui.FAILSAFE = False
 
         # Generate initial session ID
-        from datetime import datetime
         self.current_session_id = datetime.utcnow().isoformat()
 
         logger.info("ScreenCapture initialized")
@@ -55,7 +70,7 @@ class ScreenCapture:
         """Define the screen region to monitor."""
         self.region = region
         self.last_hash = None
-        from datetime import datetime
+        self._last_fp = None
         self.current_session_id = datetime.utcnow().isoformat()
         logger.info(f"Capture region set to {region}")
 
@@ -100,7 +115,7 @@ class ScreenCapture:
         # 2) Skip OCR if pHash unchanged
         if not self._has_changed(img):
             if scroll_info:
-                logger.debug(f"Scroll on unchanged: {scroll_info['direction']}")
+                logger.debug("Scroll on unchanged: %s", scroll_info['direction'])
                 self._update_markers_for_scroll(scroll_info)
             else:
                 logger.debug("Region unchanged; skipping OCR")
@@ -113,7 +128,7 @@ class ScreenCapture:
             self.overlay.clear_markers()
             return False
 
-        logger.info(f"OCR found {len(texts)} entries")
+        logger.info("OCR found %d entries", len(texts))
 
         # 4) OCR-based scroll detection & reposition
         adjusted_texts, ocr_scroll = self.scroll_tracker.track_ocr_results(texts)
@@ -139,15 +154,30 @@ class ScreenCapture:
 
         return True
 
+    def _get_sct(self):
+        """Return this thread's mss handle, creating it on first use."""
+        sct = getattr(self._sct_local, "sct", None)
+        if sct is None:
+            sct = self._sct_local.sct = mss.mss()
+        return sct
+
     def _grab_region(self, region: Tuple[int,int,int,int]) -> Optional[Image.Image]:
-        """Capture screenshot of the given region via PyAutoGUI."""
+        """Capture the given region as a grayscale image via mss, or PyAutoGUI without it.
+
+        Every downstream consumer (scroll detection, change detection, OCR)
+        works on grayscale, so the frame is converted once here.
+        """
         x, y, w, h = region
         if w <= 0 or h <= 0:
             logger.error(f"Invalid region dimensions: {w}×{h}")
             return None
         try:
-            img = pyautogui.screenshot(region=region)
-            logger.debug(f"Captured region {region}")
+            if mss is not None:
+                raw = self._get_sct().grab({"left": x, "top": y, "width": w, "height": h})
+                img = Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX").convert("L")
+            else:
+                img = pyautogui.screenshot(region=region).convert("L")
+            logger.debug("Captured region %s", region)
             return img
         except Exception as e:
             logger.error(f"Screenshot failed: {e}", exc_info=True)
@@ -158,19 +188,32 @@ class ScreenCapture:
         Compare pHash of current image to last. Returns True if diff > threshold.
         """
         try:
-            current = imagehash.phash(img)
+            # Identical sampled pixels mean nothing moved; skip the pHash
+            w, h = img.size
+            sample = img.resize(
+                (max(1, w // FINGERPRINT_STRIDE), max(1, h // FINGERPRINT_STRIDE)),
+                Image.NEAREST,
+            )
+            fp = hashlib.blake2b(sample.tobytes(), digest_size=8).digest()
+            if fp == self._last_fp and self.last_hash is not None:
+                return False
+            self._last_fp = fp
+
+            # Shares the downsampled frame scroll detection already produced
+            current = fast_phash(self.scroll_tracker.get_small_gray(img))
             if self.last_hash is None:
                 self.last_hash = current
                 return True
-            diff = current - self.last_hash
+            diff = (current ^ self.last_hash).bit_count()
             self.last_hash = current
             changed = diff > self.hash_threshold
-            logger.debug(f"Hash diff={diff}; threshold={self.hash_threshold}; changed={changed}")
+            logger.debug("Hash diff=%d; threshold=%s; changed=%s", diff, self.hash_threshold, changed)
             return changed
         except Exception as e:
             logger.error(f"Change detection error: {e}", exc_info=True)
             # fallback: always treat as changed
             self.last_hash = None
+            self._last_fp = None
             return True
 
     def _update_markers_for_scroll(self, scroll_info: Dict) -> None:
@@ -184,7 +227,7 @@ class ScreenCapture:
             adjusted = self.scroll_tracker.adjust_marker_positions(marker_dicts, scroll_info)
             tuples = [(m["x"],m["y"],m["width"],m["height"]) for m in adjusted]
             self.overlay.update_markers(tuples)
-            logger.debug(f"Updated {len(adjusted)} markers for scroll")
+            logger.debug("Updated %d markers for scroll", len(adjusted))
         except Exception as e:
             logger.error(f"Error updating markers for scroll: {e}", exc_info=True)
 
@@ -193,7 +236,6 @@ class ScreenCapture:
         self.tracker.reset_session()
         self.scroll_tracker.reset()
         self.last_hash = None
-        from datetime import datetime
         self.current_session_id = datetime.utcnow().isoformat()
         logger.info("Session reset")
 
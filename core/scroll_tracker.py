@@ -11,6 +11,9 @@ import cv2
 
 logger = logging.getLogger(__name__)
 
+# Downsample factor for the small grayscale frame shared with change detection
+SMALL_GRAY_FACTOR = 8
+
 class ScrollTracker:
     """Detects scroll events and manages marker repositioning"""
     
@@ -18,6 +21,10 @@ class ScrollTracker:
         self.scroll_threshold = scroll_threshold
         self.correlation_threshold = correlation_threshold
         self.last_image: Optional[Image.Image] = None
+        # Grayscale array of last_image, kept with the image it came from
+        self._last_gray: Optional[np.ndarray] = None
+        self._last_gray_src: Optional[Image.Image] = None
+        self._small_gray: Optional[np.ndarray] = None
         self.last_ocr_results: List[Dict] = []
         self.scroll_history: List[Dict] = []
         self.last_scroll_direction: Optional[str] = None
@@ -45,15 +52,21 @@ class ScrollTracker:
             if current_time - self.last_scroll_time < self.scroll_cooldown:
                 return None
             
-            # Convert PIL images to numpy arrays for OpenCV processing
-            current_np = np.array(current_image.convert('L'))
-            last_np = np.array(self.last_image.convert('L'))
-            
-            # Ensure images are same size
-            if current_np.shape != last_np.shape:
+            # Ensure images are same size before converting anything
+            if current_image.size != self.last_image.size:
                 self.last_image = current_image
                 return None
             
+            # Convert PIL images to numpy arrays for OpenCV processing; the
+            # previous frame's array is reused from the last call
+            if self._last_gray_src is self.last_image:
+                last_np = self._last_gray
+            else:
+                last_np = self._to_gray_array(self.last_image)
+            current_np = self._to_gray_array(current_image)
+            self._last_gray, self._last_gray_src = current_np, current_image
+            self._small_gray = None
+            
             # Use template matching to detect scroll direction
             height, width = current_np.shape
             strip_height = max(height // 4, 50)  # Use 1/4 of height or minimum 50px
@@ -88,7 +101,7 @@ class ScrollTracker:
                     'confidence': down_score,
                     'timestamp': current_time
                 }
-                logger.debug(f"Scroll down detected (confidence: {down_score:.3f})")
+                logger.debug("Scroll down detected (confidence: %.3f)", down_score)
                 
             elif up_score > self.correlation_threshold and up_score > down_score:
                 scroll_info = {
@@ -97,7 +110,7 @@ class ScrollTracker:
                     'confidence': up_score,
                     'timestamp': current_time
                 }
-                logger.debug(f"Scroll up detected (confidence: {up_score:.3f})")
+                logger.debug("Scroll up detected (confidence: %.3f)", up_score)
             
             # Update scroll history
             if scroll_info:
@@ -116,6 +129,39 @@ class ScrollTracker:
             self.last_image = current_image
             return None
     
+    @staticmethod
+    def _to_gray_array(image: Image.Image) -> np.ndarray:
+        """Grayscale uint8 view of a PIL image for OpenCV"""
+        return np.asarray(image if image.mode == 'L' else image.convert('L'))
+    
+    def get_small_gray(self, image: Image.Image) -> np.ndarray:
+        """Area-downsampled grayscale copy of image, cached per frame
+        
+        Reuses the grayscale array detect_scroll already made for the same
+        image, so change detection does not walk the full frame again.
+        
+        Args:
+            image: PIL Image object (normally the frame just passed to detect_scroll)
+            
+        Returns:
+            uint8 array at most SMALL_GRAY_FACTOR times smaller per side
+        """
+        if self._last_gray_src is image:
+            if self._small_gray is not None:
+                return self._small_gray
+            gray = self._last_gray
+        else:
+            gray = self._to_gray_array(image)
+        
+        height, width = gray.shape
+        # Stay at or above 32px so a 32×32 pHash never has to upsample
+        factor = max(1, min(SMALL_GRAY_FACTOR, min(height, width) // 32))
+        small = gray if factor == 1 else cv2.resize(
+            gray, (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+        if self._last_gray_src is image:
+            self._small_gray = small
+        return small
+    
     def adjust_marker_positions(self, markers: List[Dict], scroll_info: Dict) -> List[Dict]:
         """Adjust marker positions based on scroll direction
         
@@ -147,7 +193,7 @@ class ScrollTracker:
             if adjusted_marker['y'] + adjusted_marker['height'] > -50:  # Allow slight overflow
                 adjusted_markers.append(adjusted_marker)
         
-        logger.debug(f"Adjusted {len(adjusted_markers)} markers for {direction} scroll")
+        logger.debug("Adjusted %d markers for %s scroll", len(adjusted_markers), direction)
         return adjusted_markers
     
     def track_ocr_results(self, ocr_results: List[Dict]) -> Tuple[List[Dict], Optional[Dict]]:
@@ -225,6 +271,9 @@ class ScrollTracker:
     def reset(self):
         """Reset scroll tracking state"""
         self.last_image = None
+        self._last_gray = None
+        self._last_gray_src = None
+        self._small_gray = None
         self.last_ocr_results = []
         self.scroll_history = []
         self.last_scroll_direction = None
@@ -2,18 +2,42 @@
 Settings management for persistent configuration
 """
 
-import json
 import logging
 import os
 
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:  # optional: fall back to the stdlib encoder
+    import json
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
 class SettingsManager:
     """Manages application settings with JSON persistence"""
     
     def __init__(self, settings_file='settings.json'):
+        """
+        Args:
+            settings_file: Path of the JSON file, or a seekable binary
+                file-like object (e.g. io.BytesIO) to keep settings in memory
+        """
         self.settings_file = settings_file
         self.settings = {}
+        self._lookup_cache = {}  # dot-notation key -> resolved value
         self.default_settings = {
             'region': None,  # (x, y, width, height)
             'auto_scan': False,
@@ -42,10 +66,11 @@ class SettingsManager:
     
     def load_settings(self):
         """Load settings from JSON file"""
+        self._lookup_cache.clear()
         try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r', encoding='utf-8') as f:
-                    self.settings = json.load(f)
+            data = self._read_settings_file()
+            if data:
+                self.settings = _loads(data)
                 logger.info(f"Settings loaded from {self.settings_file}")
             else:
                 logger.info("No settings file found, using defaults")
@@ -63,8 +88,7 @@ class SettingsManager:
     def save_settings(self):
         """Save settings to JSON file"""
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            self._write_settings_file(_dumps(self.settings))
             logger.info(f"Settings saved to {self.settings_file}")
             return True
             
@@ -72,6 +96,26 @@ class SettingsManager:
             logger.error(f"Error saving settings: {str(e)}")
             return False
     
+    def _read_settings_file(self):
+        """Return the raw settings bytes, or None when there are none yet"""
+        if hasattr(self.settings_file, 'read'):
+            self.settings_file.seek(0)
+            return self.settings_file.read()
+        if os.path.exists(self.settings_file):
+            with open(self.settings_file, 'rb') as f:
+                return f.read()
+        return None
+    
+    def _write_settings_file(self, data):
+        """Replace the settings file (or stream) contents with data"""
+        if hasattr(self.settings_file, 'write'):
+            self.settings_file.seek(0)
+            self.settings_file.truncate()
+            self.settings_file.write(data)
+        else:
+            with open(self.settings_file, 'wb') as f:
+                f.write(data)
+    
     def get_setting(self, key, default=None):
         """Get a setting value
         
@@ -85,14 +129,17 @@ class SettingsManager:
         try:
             # Handle dot notation for nested keys
             if '.' in key:
-                keys = key.split('.')
-                value = self.settings
-                for k in keys:
-                    if isinstance(value, dict) and k in value:
-                        value = value[k]
-                    else:
-                        return default
-                return value
+                value = self._lookup_cache.get(key, _MISSING)
+                if value is _MISSING:
+                    value = self.settings
+                    for k in key.split('.'):
+                        if isinstance(value, dict) and k in value:
+                            value = value[k]
+                        else:
+                            value = _MISSING
+                            break
+                    self._lookup_cache[key] = value
+                return default if value is _MISSING else value
             else:
                 return self.settings.get(key, default)
                 
@@ -107,6 +154,7 @@ class SettingsManager:
             key: Setting key (supports dot notation for nested keys)
             value: Value to set
         """
+        self._lookup_cache.clear()
         try:
             # Handle dot notation for nested keys
             if '.' in key:
@@ -129,6 +177,28 @@ class SettingsManager:
         except Exception as e:
             logger.error(f"Error setting '{key}': {str(e)}")
     
+    def get_settings(self, keys, defaults=None):
+        """Get several setting values at once
+        
+        Args:
+            keys: Iterable of setting keys (dot notation supported)
+            defaults: Optional dict of per-key default values
+            
+        Returns:
+            Dictionary mapping each key to its value or default
+        """
+        defaults = defaults or {}
+        return {key: self.get_setting(key, defaults.get(key)) for key in keys}
+    
+    def set_settings(self, updates):
+        """Set several setting values at once
+        
+        Args:
+            updates: Dictionary of key (dot notation supported) to value
+        """
+        for key, value in updates.items():
+            self.set_setting(key, value)
+    
     def get_all_settings(self):
         """Get all settings
         
@@ -140,6 +210,7 @@ class SettingsManager:
     def reset_to_defaults(self):
         """Reset all settings to defaults"""
         self.settings = self.default_settings.copy()
+        self._lookup_cache.clear()
         logger.info("Settings reset to defaults")
     
     def reset_setting(self, key):
@@ -150,6 +221,7 @@ class SettingsManager:
         """
         if key in self.default_settings:
             self.settings[key] = self.default_settings[key]
+            self._lookup_cache.clear()
             logger.info(f"Setting '{key}' reset to default")
         else:
             logger.warning(f"No default value for setting '{key}'")
@@ -208,8 +280,8 @@ class SettingsManager:
             Boolean success status
         """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            with open(filename, 'wb') as f:
+                f.write(_dumps(self.settings))
             logger.info(f"Settings exported to {filename}")
             return True
             
@@ -227,8 +299,8 @@ class SettingsManager:
             Boolean success status
         """
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                imported_settings = json.load(f)
+            with open(filename, 'rb') as f:
+                imported_settings = _loads(f.read())
             
             # Validate imported settings
             if not isinstance(imported_settings, dict):
@@ -237,6 +309,7 @@ class SettingsManager:
             
             # Merge with current settings
             self.settings.update(imported_settings)
+            self._lookup_cache.clear()
             
             # Validate merged settings
             validation = self.validate_settings()
@@ -4,70 +4,198 @@
 Main GUI window for the Duplicate Name Highlighter application
 """
 
+import os
+
+# Tesseract and OpenCV size their OpenMP pools to every core; with one scan
+# at a time that only adds fork/join overhead and starves the GUI thread.
+# Must run before the OCR / OpenCV modules below are imported.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 import sys
+import csv
+import functools
+import hashlib
 import logging
+import platform
+import queue
+import sqlite3
+import subprocess
+import threading
 import time
 
 from datetime import datetime
+
+import cv2
+import numpy as np
 from PyQt5.QtGui import QPixmap, QPainter, QColor, QIcon
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QSpinBox, QCheckBox, QMessageBox,
-    QGroupBox, QSystemTrayIcon, QMenu, QAction
+    QGroupBox, QSystemTrayIcon, QMenu, QAction, QFileDialog
+)
+from PyQt5.QtCore import (
+    QTimer, pyqtSignal, QThread, Qt, QObject, QRunnable, QThreadPool, QSettings
 )
-from PyQt5.QtCore import QTimer, pyqtSignal, QThread, Qt
 
 from gui.region_selector import RegionSelector
 from gui.overlay_window import OverlayWindow
 from core.ocr_processor import OCRProcessor
-from tracker.duplicate_tracker import DuplicateTracker
+from tracker.duplicate_tracker import DuplicateTracker, DEDUP_GRID
 from core.screen_capture import ScreenCapture
 from tracker.database import Database
 
+cv2.setNumThreads(0)
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on warmed-up OCR engines shared by scan threads
+MAX_OCR_ENGINES = 4
+
+# One row per OCR token; shipped across the thread boundary as one buffer.
+# Text stays a Python object: a fixed-width 'U<n>' field would silently
+# truncate longer lines
+OCR_DTYPE = np.dtype([('text', object), ('x', 'i4'), ('y', 'i4'), ('w', 'i4'), ('h', 'i4')])
+
+
+def _to_ocr_array(names: list) -> np.ndarray:
+    """Pack OCR dicts (name, x, y, width, height) into an OCR_DTYPE array."""
+    return np.array(
+        [(n['name'], n['x'], n['y'], n['width'], n['height']) for n in names],
+        dtype=OCR_DTYPE
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _make_tray_icon() -> QIcon:
+    """Render the tray icon once; the pixmap never changes."""
+    pixmap = QPixmap(32, 32)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setBrush(QColor(255, 165, 0))
+    painter.setPen(Qt.NoPen)
+    painter.drawEllipse(4, 4, 24, 24)
+    painter.end()
+    return QIcon(pixmap)
+
+
+# Scroll and change detection keep per-frame state on the shared
+# ScreenCapture/ScrollTracker; manual and auto scans must not interleave there
+_FRAME_STATE_LOCK = threading.Lock()
+
+
+def _process_frame(screen_capture: ScreenCapture, engine_pool: queue.Queue, img, emitter):
+    """Scroll detection, change detection and OCR for one captured frame.
+
+    Results are reported through ``emitter``'s scan_completed,
+    scroll_detected and error_occurred signals.  An OCR engine is borrowed
+    from ``engine_pool`` only for the duration of the OCR call.  The
+    stateful detection steps run under ``_FRAME_STATE_LOCK``; OCR does not.
+    """
+    with _FRAME_STATE_LOCK:
+        # 1) detect scroll first
+        scroll = screen_capture.detect_scroll(img)
+        if scroll and scroll.get("confidence", 0) > 0.8:
+            emitter.scroll_detected.emit(scroll)
+            logger.info(f"Scroll: {scroll['direction']}")
+        else:
+            scroll = None
 
-class ScanWorker(QThread):
-    """Worker thread for OCR scanning operations"""
-    scan_completed   = pyqtSignal(list)
+        # 2) skip if unchanged
+        if not screen_capture.has_changed(img):
+            return
+
+    # 3) OCR
+    engine = engine_pool.get()
+    try:
+        names = engine.extract_text_with_positions(img)
+    except Exception as e:
+        emitter.error_occurred.emit(f"OCR error: {e}")
+        return
+    finally:
+        engine_pool.put(engine)
+
+    emitter.scan_completed.emit(_to_ocr_array(names), scroll)
+
+
+class ScanSignals(QObject):
+    """Signals for ScanRunnable (QRunnable is not a QObject)"""
+    scan_completed   = pyqtSignal(object, object)  # (OCR_DTYPE array, scroll | None)
     scroll_detected  = pyqtSignal(dict)
     error_occurred   = pyqtSignal(str)
+    finished         = pyqtSignal()
+
 
-    def __init__(self, screen_capture: ScreenCapture, ocr_processor: OCRProcessor, region: tuple):
+class ScanRunnable(QRunnable):
+    """Single capture/OCR pass executed on the global QThreadPool"""
+
+    def __init__(self, screen_capture: ScreenCapture, engine_pool: queue.Queue, region: tuple):
         super().__init__()
         self.screen_capture = screen_capture
-        self.ocr_processor  = ocr_processor
+        self.engine_pool    = engine_pool
         self.region         = region
-        self.running        = False
+        self.signals        = ScanSignals()
 
     def run(self):
         try:
-            self.running = True
-
-            # 1) grab screenshot
             img = self.screen_capture.capture_region(self.region)
             if img is None:
-                self.error_occurred.emit("Failed to capture screenshot")
+                self.signals.error_occurred.emit("Failed to capture screenshot")
                 return
+            _process_frame(self.screen_capture, self.engine_pool, img, self.signals)
+        except Exception as e:
+            logger.error(f"ScanRunnable error: {e}", exc_info=True)
+            self.signals.error_occurred.emit(str(e))
+        finally:
+            self.signals.finished.emit()
 
-            # 2) detect scroll first
-            scroll = self.screen_capture.detect_scroll(img)
-            if scroll and scroll.get("confidence", 0) > 0.8:
-                self.scroll_detected.emit(scroll)
-                logger.info(f"Scroll: {scroll['direction']}")
 
-            # 3) skip if unchanged
-            if not self.screen_capture.has_changed(img):
-                return
+class ScanWorker(QThread):
+    """Long-lived worker thread for change-triggered auto-scan
 
-            # 4) OCR
-            try:
-                names = self.ocr_processor.extract_text_with_positions(img)
-            except Exception as e:
-                self.error_occurred.emit(f"OCR error: {e}")
-                return
+    Polls the region every POLL_MS with a cheap byte fingerprint and only
+    runs scroll detection + OCR when the frame changed, at most once every
+    ``min_interval`` seconds.
+    """
+    scan_completed   = pyqtSignal(object, object)  # (OCR_DTYPE array, scroll | None)
+    scroll_detected  = pyqtSignal(dict)
+    error_occurred   = pyqtSignal(str)
+
+    POLL_MS = 200
 
-            self.scan_completed.emit(names)
+    def __init__(self, screen_capture: ScreenCapture, engine_pool: queue.Queue, region: tuple,
+                 min_interval: float = 0.0):
+        super().__init__()
+        self.screen_capture = screen_capture
+        self.engine_pool    = engine_pool
+        self.region         = region
+        self.min_interval   = min_interval
+        self.running        = False
+        self._last_fingerprint = None
+        self._last_ocr_ts      = 0.0
+
+    def run(self):
+        try:
+            self.running = True
+            capture_failed = False
+            while self.running:
+                img = self.screen_capture.capture_region(self.region)
+                if img is None:
+                    if not capture_failed:
+                        self.error_occurred.emit("Failed to capture screenshot")
+                    capture_failed = True
+                else:
+                    capture_failed = False
+                    # cheap check first: identical pixels -> nothing to do
+                    fingerprint = hashlib.blake2b(img.tobytes(), digest_size=8).digest()
+                    now = time.monotonic()
+                    if (fingerprint != self._last_fingerprint
+                            and now - self._last_ocr_ts >= self.min_interval):
+                        self._last_fingerprint = fingerprint
+                        self._last_ocr_ts = now
+                        _process_frame(self.screen_capture, self.engine_pool, img, self)
+                self.msleep(self.POLL_MS)
 
         except Exception as e:
             logger.error(f"ScanWorker error: {e}", exc_info=True)
@@ -81,28 +209,88 @@ class ScanWorker(QThread):
         self.wait()
 
 
+class CsvExportWorker(QThread):
+    """Worker thread that streams the seen-names table into a CSV file"""
+    progress         = pyqtSignal(int)
+    export_completed = pyqtSignal(str)
+    error_occurred   = pyqtSignal(str)
+
+    BATCH_SIZE = 4096
+
+    def __init__(self, db_path: str, path: str):
+        super().__init__()
+        self.db_path = db_path
+        self.path    = path
+
+    def run(self):
+        # own connection: sqlite3 connections must not cross threads
+        conn = sqlite3.connect(self.db_path, timeout=10.0)
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT name, first_seen_ts, total_occurrences FROM seen_names")
+            written = 0
+            with open(self.path, "w", newline="", encoding="utf-8",
+                      buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(["name", "first_seen", "count"])
+                while True:
+                    rows = cur.fetchmany(self.BATCH_SIZE)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    written += len(rows)
+                    self.progress.emit(written)
+            self.export_completed.emit(self.path)
+        except Exception as e:
+            logger.error(f"CSV export error: {e}", exc_info=True)
+            self.error_occurred.emit(str(e))
+        finally:
+            conn.close()
+
+
 class MainWindow(QMainWindow):
     """Main settings window to control scanning and display status"""
 
     def __init__(self):
         super().__init__()
         self.current_session_id = datetime.utcnow().isoformat()
+        self._last_names_sig = None     # hash of the last OCR name set
+        self._last_marker_sig = None    # duplicates last sent to the overlay
+        self._pending_markers = None    # (duplicates, region) awaiting flush
+        self._settings = QSettings("DNH", "MainWindow")
         self.setWindowTitle("Duplicate Name Highlighter")
         # let it expand vertically so nothing is clipped
         self.resize(300, 550)
+        geometry = self._settings.value("geometry")
+        if geometry is not None:
+            self.restoreGeometry(geometry)
 
         # ─── Core components ────────────────────────────────────
         self.screen_capture    = ScreenCapture()
         self.database          = Database("duplicate_names.db")
-        self.ocr_processor     = OCRProcessor()
+        # one OCRProcessor per concurrent scan; constructing (and probing)
+        # Tesseract is expensive, so engines are created once and reused
+        self.ocr_pool          = queue.Queue()
+        for _ in range(max(1, min(QThread.idealThreadCount(), MAX_OCR_ENGINES))):
+            self.ocr_pool.put(OCRProcessor())
+        self.thread_pool       = QThreadPool.globalInstance()
         self.overlay_window    = OverlayWindow()
+        # the tracker is the only writer of scan results: it persists each
+        # scan's new, normalized occurrences
         self.duplicate_tracker = DuplicateTracker(self.database,
-                                                  overlay=self.overlay_window)
+                                                  overlay=self.overlay_window,
+                                                  session_id=self.current_session_id)
 
         # ─── Region selector ───────────────────────────────────
         self.region_selector = RegionSelector()
         self.region_selector.region_selected.connect(self.on_region_selected)
 
+        # ─── Background workers ────────────────────────────────
+        self.auto_worker   = None
+        self.export_worker = None
+        self._active_scans = 0
+        self.tray_icon     = None
+
         # ─── Build UI ──────────────────────────────────────────
         central = QWidget()
         self.setCentralWidget(central)
@@ -123,7 +311,9 @@ class MainWindow(QMainWindow):
         hl.addWidget(QLabel("Interval (s):"))
         self.interval_spin = QSpinBox()
         self.interval_spin.setRange(1, 60)
-        self.interval_spin.setValue(3)
+        self.interval_spin.setValue(int(self._settings.value("interval", 3)))
+        self.interval_spin.setToolTip("Minimum time between OCR passes; "
+                                      "auto-scan only runs OCR when the region changes")
         hl.addWidget(self.interval_spin)
         layout.addLayout(hl)
 
@@ -154,19 +344,63 @@ class MainWindow(QMainWindow):
         self.status_label.setStyleSheet("color: #007ACC;")
         layout.addWidget(self.status_label)
 
-        # ─── Timer & Connections ────────────────────────────────
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.scan)
-
+        # ─── Connections ───────────────────────────────────────
         self.region_btn.clicked.connect(self.select_region)
         self.auto_cb.toggled.connect(self.on_auto_toggled)
-        self.interval_spin.valueChanged.connect(self.update_interval)
+        # apply the interval once per edit, not once per keystroke
+        self._interval_debounce = QTimer(self)
+        self._interval_debounce.setSingleShot(True)
+        self._interval_debounce.timeout.connect(
+            lambda: self.update_interval(self.interval_spin.value()))
+        self.interval_spin.valueChanged.connect(
+            lambda _v: self._interval_debounce.start(300))
         self.manual_scan_btn.clicked.connect(self.scan)
         self.reset_session_btn.clicked.connect(self.reset_session)
         self.clear_database_btn.clicked.connect(self.clear_all)
         self.export_csv_btn.clicked.connect(self.export_csv)
         self.show_logs_btn.clicked.connect(self.show_logs)
 
+    def setup_system_tray(self):
+        """Create the tray icon so closing the window keeps scanning alive
+
+        Not called by default: without a tray icon, closing the window quits.
+        """
+        self.tray_icon = QSystemTrayIcon(self)
+        self.tray_icon.setIcon(_make_tray_icon())
+        self.tray_icon.setToolTip("Duplicate Name Highlighter")
+
+        tray_menu = QMenu(self)
+        show_action = QAction("Show", self)
+        show_action.triggered.connect(self.showNormal)
+        quit_action = QAction("Quit", self)
+        quit_action.triggered.connect(self.quit_application)
+        tray_menu.addAction(show_action)
+        tray_menu.addSeparator()
+        tray_menu.addAction(quit_action)
+        self.tray_icon.setContextMenu(tray_menu)
+
+        self.tray_icon.activated.connect(
+            lambda reason: self.showNormal() if reason == QSystemTrayIcon.DoubleClick else None)
+        self.tray_icon.show()
+
+    def save_settings(self):
+        """Persist window geometry and scan interval"""
+        self._settings.setValue("interval", self.interval_spin.value())
+        self._settings.setValue("geometry", self.saveGeometry())
+
+    def quit_application(self):
+        """Stop background work and leave the event loop"""
+        self.save_settings()
+        self._stop_auto_scan()
+        if self.tray_icon is not None:
+            self.tray_icon.hide()
+        QApplication.quit()
+
+    def _set_status(self, text: str):
+        """Update the status label, skipping the repaint if nothing changed"""
+        if text != self.status_label.text():
+            self.status_label.setText(text)
+
     def select_region(self):
         """Start region selection overlay"""
         self.hide()
@@ -177,31 +411,48 @@ class MainWindow(QMainWindow):
         """Called when user finishes selecting a region"""
         if region:
             self.screen_capture.set_region(region)
-            self.status_label.setText(f"Region: {region}")
+            if self.auto_worker is not None:
+                self.auto_worker.region = region
+            self._set_status(f"Region: {region}")
             self.auto_cb.setEnabled(True)
             self.manual_scan_btn.setEnabled(True)
         else:
-            self.status_label.setText("No region selected")
+            self._set_status("No region selected")
 
     def on_auto_toggled(self, checked: bool):
-        """Enable or disable periodic scanning"""
+        """Enable or disable change-triggered scanning"""
         if checked:
             if not self.screen_capture.region:
                 QMessageBox.warning(self, "No Region Selected",
                                     "Please select a capture region first.")
                 self.auto_cb.setChecked(False)
                 return
-            self.timer.start(self.interval_spin.value() * 1000)
-            self.status_label.setText(f"Auto-scan every {self.interval_spin.value()}s")
+            self.auto_worker = ScanWorker(
+                self.screen_capture,
+                self.ocr_pool,
+                self.screen_capture.region,
+                min_interval=self.interval_spin.value()
+            )
+            self.auto_worker.scan_completed.connect(self.on_scan_completed)
+            self.auto_worker.scroll_detected.connect(self.on_scroll_detected)
+            self.auto_worker.error_occurred.connect(self.on_scan_error)
+            self.auto_worker.start()
+            self._set_status(
+                f"Auto-scan on change (at most every {self.interval_spin.value()}s)")
         else:
-            self.timer.stop()
-            self.status_label.setText("Auto-scan disabled")
+            self._stop_auto_scan()
+            self._set_status("Auto-scan disabled")
+
+    def _stop_auto_scan(self):
+        """Stop the polling worker, if any"""
+        if self.auto_worker is not None:
+            self.auto_worker.stop()
+            self.auto_worker = None
 
     def update_interval(self, value: int):
-        """Adjust scan interval"""
-        self.timer.setInterval(value * 1000)
-        if self.auto_cb.isChecked():
-            self.timer.start()
+        """Adjust the minimum time between OCR passes"""
+        if self.auto_worker is not None:
+            self.auto_worker.min_interval = value
 
     def scan(self):
         """Kick off one OCR pass in background"""
@@ -210,25 +461,54 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Region Selected",
                                 "Please select a capture region first.")
             return
-
-        # don't overlap
-        if hasattr(self, 'scan_worker') and self.scan_worker.isRunning():
+        # one manual scan at a time; the button comes back in _on_scan_finished
+        if self._active_scans:
             return
 
-        self.status_label.setText("Scanning…")
+        self._set_status("Scanning…")
         self.manual_scan_btn.setEnabled(False)
 
-        # start worker
-        self.scan_worker = ScanWorker(
+        # run on the shared pool, alongside any auto-scan (frame state is
+        # guarded in _process_frame)
+        runnable = ScanRunnable(
             self.screen_capture,
-            self.ocr_processor,
+            self.ocr_pool,
             self.screen_capture.region
         )
-        self.scan_worker.scan_completed.connect(self.on_scan_completed)
-        self.scan_worker.scroll_detected.connect(self.on_scroll_detected)
-        self.scan_worker.error_occurred.connect(self.on_scan_error)
-        self.scan_worker.finished.connect(lambda: self.manual_scan_btn.setEnabled(True))
-        self.scan_worker.start()
+        runnable.signals.scan_completed.connect(self.on_scan_completed)
+        runnable.signals.scroll_detected.connect(self.on_scroll_detected)
+        runnable.signals.error_occurred.connect(self.on_scan_error)
+        runnable.signals.finished.connect(self._on_scan_finished)
+        self._active_scans += 1
+        self.thread_pool.start(runnable)
+
+    def _on_scan_finished(self):
+        """Re-enable manual scanning once every in-flight scan is done"""
+        self._active_scans -= 1
+        if self._active_scans == 0:
+            self.manual_scan_btn.setEnabled(True)
+
+    def _queue_markers(self, duplicates: list, region: tuple):
+        """Schedule an overlay update, skipping unchanged marker sets
+
+        Updates are coalesced so the overlay repaints at most every 100 ms.
+        """
+        sig = tuple(sorted(
+            (d['name'], d['count'], tuple((p['x'], p['y']) for p in d['positions']))
+            for d in duplicates
+        ))
+        if sig == self._last_marker_sig:
+            return
+        self._last_marker_sig = sig
+        if self._pending_markers is None:
+            QTimer.singleShot(100, self._flush_markers)
+        self._pending_markers = (duplicates, region)
+
+    def _flush_markers(self):
+        """Push the latest queued marker set to the overlay"""
+        if self._pending_markers is not None:
+            self.overlay_window.update_markers(*self._pending_markers)
+            self._pending_markers = None
 
     def on_scroll_detected(self, info: dict):
         """Move markers when the page scrolls"""
@@ -236,54 +516,55 @@ class MainWindow(QMainWindow):
         if markers:
             adjusted = self.screen_capture.adjust_marker_positions(markers, info)
             self.overlay_window.update_markers_from_adjusted(adjusted)
-        self.status_label.setText(f"Scroll: {info['direction']}")
+            # overlay no longer shows the last queued set verbatim
+            self._last_marker_sig = None
+        self._set_status(f"Scroll: {info['direction']}")
 
     def on_scan_error(self, msg: str):
         """Show OCR or capture error"""
-        self.status_label.setText(f"Error: {msg}")
-        self.manual_scan_btn.setEnabled(True)
-
-    def on_scan_completed(self, names_with_positions: list):
-        """Process OCR results & highlight duplicates"""
-        # 1) detect scroll info
-        scroll_info = None
-        hist = getattr(self.screen_capture, "get_scroll_history", lambda: [])()
-        if hist:
-            scroll_info = hist[-1]
-
-        # — persist this scan’s raw OCR texts into SQLite —
-        texts = [item['text'] for item in names_with_positions]
-        for txt in texts:
-            self.database.add_name_occurrence(txt, count=1,
-                                              session_id=self.current_session_id)
-
-        # 2) find duplicates
-        duplicates = self.duplicate_tracker.process_names(names_with_positions, scroll_info)
+        self._set_status(f"Error: {msg}")
+
+    def on_scan_completed(self, tokens: np.ndarray, scroll_info: dict = None):
+        """Process OCR results (an OCR_DTYPE array) & highlight duplicates
+
+        ``scroll_info`` is the scroll detected on the same frame, if any.
+        """
+        texts = tokens['text'].tolist()
+
+        # 1) boxes straight from the columns, one (x, y, w, h) row per token
+        positions = np.column_stack((tokens['x'], tokens['y'], tokens['w'], tokens['h']))
+
+        # 0) same names at (about) the same places as the previous frame:
+        # the overlay is still right, but a scroll must still reach the
+        # tracker's position history
+        sig = hash(tuple(sorted(zip(texts, map(tuple, (positions // DEDUP_GRID).tolist())))))
+        if sig == self._last_names_sig:
+            if scroll_info:
+                self.duplicate_tracker.adjust_existing_positions(scroll_info)
+            self._set_status("No changes since last scan")
+            return
+        self._last_names_sig = sig
+
+        # 2) find duplicates; the tracker also persists what is new
+        duplicates = self.duplicate_tracker.process_names(texts, scroll_info,
+                                                          positions=positions)
 
         # 3) update overlay
         if duplicates:
-            region = self.screen_capture.region
-            self.overlay_window.update_markers(duplicates, region)
-            self.status_label.setText(f"Found {len(duplicates)} duplicates")
+            self._queue_markers(duplicates, self.screen_capture.region)
+            self._set_status(f"Found {len(duplicates)} duplicates")
         else:
+            self._pending_markers = None
+            self._last_marker_sig = None
             self.overlay_window.clear_markers()
-            self.status_label.setText("No duplicates found")
+            self._set_status("No duplicates found")
 
-        # 4) show final session stats
-        ok = False
-        try:
-            ok = self.screen_capture.capture_and_process()
-        except Exception as e:
-            logger.error(f"Final capture error: {e}", exc_info=True)
-
-        stats = getattr(self.screen_capture, "get_statistics", lambda: {})()
-        if ok and stats:
-            self.status_label.setText(
-                f"Session: {stats.get('session_names',0)} names, "
-                f"{stats.get('session_occurrences',0)} occurrences"
-            )
-
-        self.manual_scan_btn.setEnabled(True)
+        # 4) show session stats; the tracker caches them until the next change
+        stats = self.duplicate_tracker.get_statistics()
+        self._set_status(
+            f"Session: {stats.get('session_names',0)} names, "
+            f"{stats.get('session_occurrences',0)} occurrences"
+        )
 
     def reset_session(self):
         """Clear the in-memory duplicate-tracker state"""
@@ -291,7 +572,9 @@ class MainWindow(QMainWindow):
                                 "Clear current session data?",
                                 QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
             self.screen_capture.reset_session()
-            self.status_label.setText("Session reset")
+            self._last_names_sig = None
+            self._last_marker_sig = None
+            self._set_status("Session reset")
 
     def clear_all(self):
         """Wipe both session & database"""
@@ -299,30 +582,37 @@ class MainWindow(QMainWindow):
                                 "Delete all stored data?",
                                 QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
             self.database.clear_all()
-            self.status_label.setText("Database cleared")
+            self._last_names_sig = None
+            self._last_marker_sig = None
+            self._set_status("Database cleared")
 
     def export_csv(self):
-        """Export seen names to a CSV file"""
-        from PyQt5.QtWidgets import QFileDialog
-        import csv, os
+        """Export seen names to a CSV file in the background"""
+        if self.export_worker is not None and self.export_worker.isRunning():
+            return
         folder = QFileDialog.getExistingDirectory(self, "Select Export Folder")
         if not folder:
-            self.status_label.setText("Export cancelled")
+            self._set_status("Export cancelled")
             return
         path = os.path.join(folder, f"duplicates_{int(time.time())}.csv")
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["name", "first_seen", "count"])
-            for row in self.database.get_all_seen_names():
-                writer.writerow(row)
-        self.status_label.setText(f"Exported CSV to {path}")
+
+        self.export_csv_btn.setEnabled(False)
+        self._set_status("Exporting CSV…")
+        self.export_worker = CsvExportWorker(self.database.db_file, path)
+        self.export_worker.progress.connect(
+            lambda n: self._set_status(f"Exporting CSV… {n} rows"))
+        self.export_worker.export_completed.connect(
+            lambda p: self._set_status(f"Exported CSV to {p}"))
+        self.export_worker.error_occurred.connect(
+            lambda msg: self._set_status(f"Export failed: {msg}"))
+        self.export_worker.finished.connect(lambda: self.export_csv_btn.setEnabled(True))
+        self.export_worker.start()
 
     def show_logs(self):
         """Open the current log file in the system editor"""
-        import platform, subprocess, os
         log = "duplicate_highlighter.log"
         if not os.path.exists(log):
-            self.status_label.setText("No log file found")
+            self._set_status("No log file found")
             return
         try:
             if platform.system() == "Windows":
@@ -331,17 +621,19 @@ class MainWindow(QMainWindow):
                 subprocess.run(["open", log], check=True)
             else:
                 subprocess.run(["xdg-open", log], check=True)
-            self.status_label.setText("Log opened")
+            self._set_status("Log opened")
         except Exception as e:
             logger.error(f"Open log error: {e}")
-            self.status_label.setText("Failed to open log")
+            self._set_status("Failed to open log")
 
     def closeEvent(self, event):
         """Minimize to tray or quit cleanly"""
-        if hasattr(self, "tray_icon") and self.tray_icon.isVisible():
+        if self.tray_icon is not None and self.tray_icon.isVisible():
             self.hide()
             event.ignore()
         else:
+            self.save_settings()
+            self._stop_auto_scan()
             event.accept()
 
 def main():
@@ -4,29 +4,55 @@ Transparent overlay window for displaying duplicate name markers
 
 import logging
 from typing import List, Tuple, Dict
+
+import numpy as np
 from PyQt5.QtWidgets import QWidget, QApplication
 from PyQt5.QtCore import Qt, QRect
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush
+from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QRegion
 
 logger = logging.getLogger(__name__)
 
+
+def _as_marker_array(boxes) -> np.ndarray:
+    """Return boxes (x, y, width, height) as an (N, 4) int32 array"""
+    return np.asarray(boxes, dtype=np.int32).reshape(-1, 4)
+
+
 class Overlay:
     """Transparent overlay for displaying duplicate name markers"""
     
     def __init__(self):
         self.widget = OverlayWidget()
+        self._last_marker_hash = None  # hash of the boxes last shown
         self.widget.show()  # Keep the overlay window ready
         self.clear_markers()
         logger.info("Overlay initialized")
         
     def update_markers(self, boxes: List[Tuple[int, int, int, int]]):
         """Update markers with new duplicate boxes"""
-        self.widget.markers = boxes
-        self.widget.update()
-        if boxes:
+        markers = _as_marker_array(boxes)
+        # same boxes as last time: nothing to show, hide or repaint
+        new_hash = hash(markers.tobytes())
+        if new_hash == self._last_marker_hash:
+            return
+        self._last_marker_hash = new_hash
+        
+        if len(markers):
+            # repaint the full areas of markers that appeared or went away
+            # (old ∪ new); markers present in both sets are left untouched.
+            # Borders are outlines, so an XOR of filled areas would leave
+            # stale lines where a moved marker overlaps its old spot.
+            old_boxes = set(map(tuple, self.widget.markers.tolist()))
+            new_boxes = set(map(tuple, markers.tolist()))
+            changed = _as_marker_array(sorted(old_boxes ^ new_boxes))
+            dirty = self.widget.marker_region(changed)
+            self.widget.markers = markers
             self.widget.show()
+            self.widget.update(dirty)
             logger.info(f"Overlay: {len(boxes)} markers shown")
         else:
+            # hidden widgets don't paint, so no update() needed
+            self.widget.markers = markers
             self.widget.hide()
             logger.info("Overlay: no markers to show, hiding overlay")
     
@@ -38,9 +64,8 @@ class Overlay:
             offset_x: Horizontal offset to apply
             offset_y: Vertical offset to apply
         """
-        adjusted_boxes = []
-        for x, y, w, h in boxes:
-            adjusted_boxes.append((x + offset_x, y + offset_y, w, h))
+        adjusted_boxes = _as_marker_array(boxes) + np.array(
+            [offset_x, offset_y, 0, 0], dtype=np.int32)
         
         self.update_markers(adjusted_boxes)
         logger.debug(f"Updated {len(adjusted_boxes)} markers with offset ({offset_x}, {offset_y})")
@@ -51,48 +76,65 @@ class Overlay:
         Args:
             scroll_info: Dictionary with 'direction' and 'magnitude' keys
         """
-        if not scroll_info or not self.widget.markers:
+        if not scroll_info or not len(self.widget.markers):
             return
         
         direction = scroll_info['direction']
         magnitude = scroll_info['magnitude']
         
-        adjusted_markers = []
-        for x, y, w, h in self.widget.markers:
-            if direction == 'down':
-                # Content scrolled down, markers move up
-                new_y = y - magnitude
-            elif direction == 'up':
-                # Content scrolled up, markers move down
-                new_y = y + magnitude
-            else:
-                new_y = y
-            
-            # Check if marker is still within visible area (with tolerance)
-            if new_y + h > -50:  # Allow slight overflow
-                adjusted_markers.append((x, new_y, w, h))
+        if direction == 'down':
+            # Content scrolled down, markers move up
+            dy = -magnitude
+        elif direction == 'up':
+            # Content scrolled up, markers move down
+            dy = magnitude
+        else:
+            dy = 0
+        
+        adjusted_markers = self.widget.markers.copy()
+        adjusted_markers[:, 1] += dy
+        # Keep markers still within visible area (with tolerance)
+        adjusted_markers = adjusted_markers[adjusted_markers[:, 1] + adjusted_markers[:, 3] > -50]
         
         self.widget.markers = adjusted_markers
+        self._last_marker_hash = None
         self.widget.update()
         logger.debug(f"Adjusted {len(adjusted_markers)} markers for {direction} scroll")
     
     def clear_markers(self):
         """Clear all markers"""
-        self.widget.markers = []
+        self.widget.markers = _as_marker_array([])
+        self._last_marker_hash = None
         self.widget.hide()
         logger.info("Overlay markers cleared")
     
-    def get_marker_positions(self) -> List[Tuple[int, int, int, int]]:
-        """Get current marker positions"""
-        return self.widget.markers.copy()
+    def get_marker_positions(self) -> Tuple[Tuple[int, int, int, int], ...]:
+        """Get current marker positions (read-only snapshot)"""
+        return tuple(map(tuple, self.widget.markers.tolist()))
+    
+    @property
+    def marker_count(self) -> int:
+        """Number of markers currently shown"""
+        return len(self.widget.markers)
+    
+    def has_marker_at(self, x: int, y: int) -> bool:
+        """Whether any marker box contains the point (x, y)"""
+        m = self.widget.markers
+        return bool(np.any((m[:, 0] <= x) & (x < m[:, 0] + m[:, 2]) &
+                           (m[:, 1] <= y) & (y < m[:, 1] + m[:, 3])))
 
 
 class OverlayWidget(QWidget):
     """Transparent widget for drawing markers"""
+
+    DOT_SIZE = 8  # corner dot diameter
     
     def __init__(self):
         super().__init__()
-        self.markers: List[Tuple[int, int, int, int]] = []
+        self.markers: np.ndarray = _as_marker_array([])  # (N, 4) x, y, w, h
+        # paint resources are built once, not per marker per frame
+        self._border_pen = QPen(QColor(255, 0, 0, 180), 2)  # semi-transparent red
+        self._dot_brush = QBrush(QColor(255, 0, 0, 255))    # solid red
         self._setup_window()
         
     def _setup_window(self):
@@ -101,53 +143,81 @@ class OverlayWidget(QWidget):
             Qt.FramelessWindowHint
             | Qt.WindowStaysOnTopHint
             | Qt.Tool
+            # Click-through handled by the window system, so Qt never
+            # hit-tests this screen-sized widget
+            | Qt.WindowTransparentForInput
         )
         self.setWindowFlags(flags)
         
         # Transparent background
         self.setAttribute(Qt.WA_TranslucentBackground, True)
-        # Click-through: mouse events pass through to underlying windows
-        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
         # Do not steal focus when shown
         self.setAttribute(Qt.WA_ShowWithoutActivating, True)
         
         # Cover the entire virtual desktop
         screen = QApplication.primaryScreen()
+        self._screen_geom = screen.geometry() if screen else None
         if screen:
-            screen_geom = screen.geometry()
-            self.setGeometry(screen_geom)
+            screen.geometryChanged.connect(self._on_geom_changed)
+            self.setGeometry(self._screen_geom)
         logger.info("OverlayWidget window configured")
+
+    def _on_geom_changed(self, geom: QRect):
+        """Follow resolution changes of the primary screen"""
+        self._screen_geom = geom
+        self.setGeometry(geom)
     
+    def marker_rect(self, x: int, y: int, w: int, h: int) -> QRect:
+        """Area painted for one marker: the dot sticks out top-left and
+        the 2px pen 1px on every side"""
+        half_dot = self.DOT_SIZE // 2
+        return QRect(x, y, w, h).adjusted(-half_dot, -half_dot, 1, 1)
+
+    def marker_region(self, markers: np.ndarray) -> QRegion:
+        """Union of the painted areas of ``markers``"""
+        region = QRegion()
+        for x, y, w, h in markers.tolist():
+            region += self.marker_rect(x, y, w, h)
+        return region
+
     def paintEvent(self, event):
-        """Draw all markers"""
-        if not self.markers:
+        """Draw the markers intersecting the exposed region"""
+        if not len(self.markers):
             return
         
+        exposed = event.region()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRegion(exposed)
         
-        for x, y, w, h in self.markers:
-            self._draw_marker(painter, QRect(x, y, w, h))
-    
-    def _draw_marker(self, painter: QPainter, rect: QRect):
-        """Draw a semi-transparent rectangle and a corner dot"""
-        # Semi-transparent red border
-        pen = QPen(QColor(255, 0, 0, 180), 2)
-        painter.setPen(pen)
+        # all markers share one pen/brush: draw every border, then every
+        # dot, so painter state changes twice per frame, not per marker
+        half_dot = self.DOT_SIZE // 2
+        
+        # cheap bounds cull against the exposed bounding rect first, then
+        # the exact region test only for the survivors
+        er = event.rect()
+        m = self.markers
+        visible = m[(m[:, 0] - half_dot <= er.right()) & (m[:, 1] - half_dot <= er.bottom()) &
+                    (m[:, 0] + m[:, 2] + 1 >= er.left()) & (m[:, 1] + m[:, 3] + 1 >= er.top())]
+        rects = [QRect(x, y, w, h) for x, y, w, h in visible.tolist()
+                 if exposed.intersects(self.marker_rect(x, y, w, h))]
+        if not rects:
+            return
+        
+        # Semi-transparent red borders; axis-aligned on integer coords,
+        # so antialiasing only costs time here
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setPen(self._border_pen)
         painter.setBrush(Qt.NoBrush)
-        painter.drawRect(rect)
+        painter.drawRects(rects)
         
-        # Solid red corner dot
-        dot_size = 8
-        brush = QBrush(QColor(255, 0, 0, 255))
-        painter.setBrush(brush)
+        # Solid red corner dots
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(self._dot_brush)
         painter.setPen(Qt.NoPen)
-        painter.drawEllipse(
-            rect.topLeft().x() - dot_size//2,
-            rect.topLeft().y() - dot_size//2,
-            dot_size,
-            dot_size
-        )
+        for rect in rects:
+            painter.drawEllipse(rect.x() - half_dot, rect.y() - half_dot,
+                                self.DOT_SIZE, self.DOT_SIZE)
     
     def showEvent(self, event):
         """Ensure overlay stays on top without taking focus"""
@@ -157,9 +227,7 @@ class OverlayWidget(QWidget):
     def resizeEvent(self, event):
         """Keep overlay covering the full screen on resolution changes"""
         super().resizeEvent(event)
-        screen = QApplication.primaryScreen()
-        if screen:
-            geom = screen.geometry()
-            if self.geometry() != geom:
-                self.setGeometry(geom)
-                logger.info("OverlayWidget resized to full screen")
+        geom = self._screen_geom
+        if geom is not None and self.geometry() != geom:
+            self.setGeometry(geom)
+            logger.info("OverlayWidget resized to full screen")
@@ -3,24 +3,93 @@ Transparent overlay window for displaying duplicate name markers
 """
 
 import logging
+from dataclasses import dataclass
 from PyQt5.QtWidgets import QWidget, QApplication
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QFont
+from PyQt5.QtCore import Qt, QRect, QVariantAnimation, QAbstractAnimation
+from PyQt5.QtGui import (
+    QPainter, QPen, QColor, QBrush, QFont, QFontMetrics, QPixmap, QRegion
+)
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(slots=True)
+class Marker:
+    """One highlighted box in absolute screen coordinates"""
+    x: int
+    y: int
+    width: int
+    height: int
+    name: str
+    color: QColor
+    count: int
+
+    def to_dict(self):
+        """Dict form used by the scroll-adjustment helpers"""
+        return {'x': self.x, 'y': self.y, 'width': self.width, 'height': self.height,
+                'name': self.name, 'color': self.color, 'count': self.count}
+
+    @classmethod
+    def from_dict(cls, d):
+        """Build a Marker from a marker dict (e.g. after scroll adjustment)"""
+        return cls(d['x'], d['y'], d['width'], d['height'],
+                   d['name'], d['color'], d['count'])
+
+
 class OverlayWindow(QWidget):
     """Transparent overlay window for displaying markers"""
+
+    INDICATOR_SIZE = 8  # corner dot diameter
+    BADGE_SIZE = 16     # occurrence-count badge diameter
+    PULSE_LEVELS = 5    # distinct alpha steps between 80% and 100%
     
     def __init__(self):
         super().__init__()
-        self.markers = []  # List of marker data: (x, y, width, height, name, color)
+        self.markers = []  # List of Marker
+        # pre-rendered size-independent marker parts; borders depend on the
+        # box size, which differs for every OCR box, so they are drawn directly
+        self._dot_sprites = {}    # indicator dot keyed by rgba (colors x pulse levels)
+        self._badge_sprites = {}  # count badge keyed by count
+        # union of marker rects, repainted on each animation tick
+        self._dirty_region = QRegion()
+
+        # paint resources are built once, not per marker per frame
+        self._colors_by_count = {
+            2: QColor(255, 165, 0, 180),     # Orange for first duplicate
+            3: QColor(255, 69, 0, 180),      # Red-orange for second duplicate
+            'many': QColor(255, 0, 0, 180),  # Red for multiple duplicates
+        }
+        # subtle pulse between 80% and 100% alpha, quantized to
+        # PULSE_LEVELS steps so the sprite cache stays small
+        self._animated_colors = {
+            (key, level): QColor(base.red(), base.green(), base.blue(),
+                                 int(base.alpha() * self._pulse_factor(level)))
+            for key, base in self._colors_by_count.items()
+            for level in range(self.PULSE_LEVELS)
+        }
+        self._pulse_level = self.PULSE_LEVELS - 1
+        self._badge_font = QFont()
+        self._badge_font.setPointSize(8)
+        self._badge_font.setBold(True)
+        self._badge_metrics = QFontMetrics(self._badge_font)
+        self._badge_text_rects = {}  # count -> text bounding rect
+        self._badge_brush = QBrush(QColor(255, 255, 255, 200))
+        self._badge_pen = QPen(QColor(0, 0, 0), 1)
+        self._text_pen = QPen(QColor(0, 0, 0))
+        # scratch objects recolored per marker instead of reallocated
+        self._border_pen = QPen(QColor(), 2, Qt.SolidLine)
+        self._scratch_indicator = QColor()
+        self._indicator_brush = QBrush(Qt.SolidPattern)
         self.setup_ui()
         
-        # Timer for marker animations (optional)
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self.update_animation)
-        self.animation_frame = 0
+        # Marker pulse; Qt pauses it while the overlay is hidden
+        self._pulse = QVariantAnimation(self)
+        self._pulse.setDuration(1000)
+        self._pulse.setStartValue(0.8)
+        self._pulse.setKeyValueAt(0.5, 1.0)
+        self._pulse.setEndValue(0.8)
+        self._pulse.setLoopCount(-1)
+        self._pulse.valueChanged.connect(self._on_pulse)
     
     def setup_ui(self):
         """Setup the overlay window"""
@@ -32,11 +101,17 @@ class OverlayWindow(QWidget):
         
         # Set window to cover entire screen
         screen = QApplication.primaryScreen()
-        screen_geometry = screen.geometry()
-        self.setGeometry(screen_geometry)
+        self._screen_geom = screen.geometry()
+        screen.geometryChanged.connect(self._on_geom_changed)
+        self.setGeometry(self._screen_geom)
         
         logger.info("Overlay window initialized")
     
+    def _on_geom_changed(self, geom):
+        """Follow resolution changes of the primary screen"""
+        self._screen_geom = geom
+        self.setGeometry(geom)
+    
     def update_markers(self, duplicates, region):
         """Update markers for duplicate names
         
@@ -59,37 +134,22 @@ class OverlayWindow(QWidget):
             count = duplicate['count']
             
             # Determine marker color based on occurrence count
-            if count == 2:
-                color = QColor(255, 165, 0, 180)  # Orange for first duplicate
-            elif count == 3:
-                color = QColor(255, 69, 0, 180)   # Red-orange for second duplicate
-            else:
-                color = QColor(255, 0, 0, 180)    # Red for multiple duplicates
+            color = self._colors_by_count.get(count, self._colors_by_count['many'])
             
             # Add marker for each position of this duplicate name
             for pos in positions:
                 # Convert relative position to absolute screen coordinates
-                marker_x = region_x + pos['x']
-                marker_y = region_y + pos['y']
-                marker_width = pos['width']
-                marker_height = pos['height']
-                
-                self.markers.append({
-                    'x': marker_x,
-                    'y': marker_y,
-                    'width': marker_width,
-                    'height': marker_height,
-                    'name': name,
-                    'color': color,
-                    'count': count
-                })
+                self.markers.append(Marker(region_x + pos['x'], region_y + pos['y'],
+                                           pos['width'], pos['height'],
+                                           name, color, count))
         
+        self._rebuild_dirty_region()
         if self.markers:
             self.show()
             self.update()
             # Start subtle animation
-            if not self.animation_timer.isActive():
-                self.animation_timer.start(500)  # Update every 500ms
+            if self._pulse.state() == QAbstractAnimation.Stopped:
+                self._pulse.start()
             logger.info(f"Updated overlay with {len(self.markers)} markers")
         else:
             self.hide()
@@ -100,7 +160,8 @@ class OverlayWindow(QWidget):
         Args:
             adjusted_markers: List of marker dictionaries with adjusted positions
         """
-        self.markers = adjusted_markers
+        self.markers = [Marker.from_dict(m) for m in adjusted_markers]
+        self._rebuild_dirty_region()
         
         if self.markers:
             self.show()
@@ -115,99 +176,199 @@ class OverlayWindow(QWidget):
         Returns:
             List of current marker dictionaries
         """
-        return self.markers.copy()
+        return [m.to_dict() for m in self.markers]
     
     def clear_markers(self):
         """Clear all markers"""
         self.markers = []
-        self.animation_timer.stop()
+        self._dirty_region = QRegion()
+        self._pulse.stop()
         self.hide()
         logger.info("Overlay markers cleared")
     
+    def marker_rect(self, marker):
+        """Bounding rect of everything draw_marker paints for a marker
+
+        Covers the border pen, the corner dot and the count badge.
+        """
+        half_dot = self.INDICATOR_SIZE // 2
+        half_badge = self.BADGE_SIZE // 2
+        return QRect(marker.x - half_dot,
+                     marker.y - half_badge,
+                     marker.width + half_dot + 2,
+                     marker.height + half_badge + 2)
+
+    def _rebuild_dirty_region(self):
+        """Recompute the union of marker rects after the marker list changed"""
+        region = QRegion()
+        for marker in self.markers:
+            region += self.marker_rect(marker)
+        self._dirty_region = region
+
     def paintEvent(self, event):
-        """Paint the markers on the overlay"""
+        """Paint the markers intersecting the exposed region"""
         if not self.markers:
             return
         
+        exposed = event.region()
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRegion(exposed)
+        
+        er = event.rect()
+        ex1, ey1, ex2, ey2 = er.left(), er.top(), er.right(), er.bottom()
+        half_dot = self.INDICATOR_SIZE // 2
+        half_badge = self.BADGE_SIZE // 2
+        
+        # borders are axis-aligned: no antialiasing; the pen is only
+        # recolored when the marker color changes
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        painter.setBrush(Qt.NoBrush)
+        pen_rgba = None
         
         for marker in self.markers:
-            self.draw_marker(painter, marker)
+            # integer-only rejection before building any QRect
+            x, y = marker.x, marker.y
+            if (x - half_dot > ex2 or y - half_badge > ey2 or
+                    x + marker.width + 2 < ex1 or y + marker.height + 2 < ey1):
+                continue
+            if not exposed.intersects(self.marker_rect(marker)):
+                continue
+            color = self._animated_color(marker.count)
+            if color.rgba() != pen_rgba:
+                pen_rgba = color.rgba()
+                self._border_pen.setColor(color)
+                painter.setPen(self._border_pen)
+            painter.drawRect(x, y, marker.width, marker.height)
+            painter.drawPixmap(x - half_dot, y - half_dot, self._get_dot_sprite(color))
+            if marker.count > 2:
+                painter.drawPixmap(x + marker.width - self.BADGE_SIZE - 1, y - half_badge - 1,
+                                   self._get_badge_sprite(marker.count))
+    
+    def _animated_color(self, count):
+        """Marker color for ``count`` with the current pulse alpha applied"""
+        key = count if count in self._colors_by_count else 'many'
+        return self._animated_colors[(key, self._pulse_level)]
+    
+    @classmethod
+    def _pulse_factor(cls, level):
+        """Alpha factor for a quantized pulse level"""
+        return 0.8 + 0.2 * level / (cls.PULSE_LEVELS - 1)
+    
+    def _get_dot_sprite(self, color):
+        """Return the cached corner-indicator pixmap for ``color``
+        
+        There are at most three colors times PULSE_LEVELS alpha steps.
+        """
+        sprite = self._dot_sprites.get(color.rgba())
+        if sprite is None:
+            sprite = QPixmap(self.INDICATOR_SIZE + 1, self.INDICATOR_SIZE + 1)
+            sprite.fill(Qt.transparent)
+            painter = QPainter(sprite)
+            self._render_dot(painter, 0, 0, color)
+            painter.end()
+            self._dot_sprites[color.rgba()] = sprite
+        return sprite
+    
+    def _get_badge_sprite(self, count):
+        """Return the cached count-badge pixmap (1px margin for the outline)"""
+        sprite = self._badge_sprites.get(count)
+        if sprite is None:
+            sprite = QPixmap(self.BADGE_SIZE + 2, self.BADGE_SIZE + 2)
+            sprite.fill(Qt.transparent)
+            painter = QPainter(sprite)
+            self._render_badge(painter, 1, 1, count)
+            painter.end()
+            self._badge_sprites[count] = sprite
+        return sprite
     
     def draw_marker(self, painter, marker):
         """Draw a single marker
         
         Args:
             painter: QPainter instance
-            marker: Dictionary containing marker information
+            marker: Marker to draw
         """
-        x = marker['x']
-        y = marker['y']
-        width = marker['width']
-        height = marker['height']
-        color = marker['color']
-        name = marker['name']
-        count = marker['count']
-        
-        # Apply animation effect (subtle pulsing)
-        alpha_factor = 0.8 + 0.2 * (0.5 + 0.5 * 
-                      (1 if self.animation_frame % 2 == 0 else -1))
-        animated_color = QColor(color)
-        animated_color.setAlpha(int(color.alpha() * alpha_factor))
-        
-        # Draw border rectangle
-        border_pen = QPen(animated_color, 2, Qt.SolidLine)
-        painter.setPen(border_pen)
+        self._render_marker(painter, marker.x, marker.y,
+                            marker.width, marker.height,
+                            self._animated_color(marker.count), marker.count)
+    
+    def _render_marker(self, painter, x, y, width, height, animated_color, count):
+        """Draw border, corner indicator and count badge at (x, y)"""
+        # Draw border rectangle; axis-aligned, so no antialiasing
+        painter.setRenderHint(QPainter.Antialiasing, False)
+        self._border_pen.setColor(animated_color)
+        painter.setPen(self._border_pen)
         painter.setBrush(Qt.NoBrush)
         painter.drawRect(x, y, width, height)
         
-        # Draw corner indicator (small filled circle)
-        indicator_size = 8
-        indicator_color = QColor(animated_color)
-        indicator_color.setAlpha(255)  # Make indicator fully opaque
-        
-        painter.setBrush(QBrush(indicator_color))
-        painter.setPen(Qt.NoPen)
-        painter.drawEllipse(x - indicator_size//2, y - indicator_size//2, 
-                          indicator_size, indicator_size)
+        self._render_dot(painter, x - self.INDICATOR_SIZE // 2,
+                         y - self.INDICATOR_SIZE // 2, animated_color)
         
         # Draw occurrence count badge
         if count > 2:
-            badge_size = 16
-            badge_x = x + width - badge_size
-            badge_y = y - badge_size//2
-            
-            # Badge background
-            badge_bg = QColor(255, 255, 255, 200)
-            painter.setBrush(QBrush(badge_bg))
-            painter.setPen(QPen(QColor(0, 0, 0), 1))
-            painter.drawEllipse(badge_x, badge_y, badge_size, badge_size)
-            
-            # Badge text
-            font = QFont()
-            font.setPointSize(8)
-            font.setBold(True)
-            painter.setFont(font)
-            painter.setPen(QPen(QColor(0, 0, 0)))
-            
-            text_rect = painter.fontMetrics().boundingRect(str(count))
-            text_x = badge_x + (badge_size - text_rect.width()) // 2
-            text_y = badge_y + (badge_size + text_rect.height()) // 2 - 2
-            
-            painter.drawText(text_x, text_y, str(count))
+            self._render_badge(painter, x + width - self.BADGE_SIZE,
+                               y - self.BADGE_SIZE // 2, count)
+    
+    def _render_dot(self, painter, left, top, animated_color):
+        """Draw the corner indicator (small filled circle) with its top-left at (left, top)"""
+        indicator_size = self.INDICATOR_SIZE
+        # Make indicator fully opaque
+        self._scratch_indicator.setRgb(animated_color.red(), animated_color.green(),
+                                       animated_color.blue(), 255)
+        self._indicator_brush.setColor(self._scratch_indicator)
+        
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(self._indicator_brush)
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(left, top, indicator_size, indicator_size)
+    
+    def _render_badge(self, painter, badge_x, badge_y, count):
+        """Draw the occurrence count badge with its top-left at (badge_x, badge_y)"""
+        badge_size = self.BADGE_SIZE
+        
+        # Badge background
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(self._badge_brush)
+        painter.setPen(self._badge_pen)
+        painter.drawEllipse(badge_x, badge_y, badge_size, badge_size)
+        
+        # Badge text
+        painter.setRenderHint(QPainter.TextAntialiasing, True)
+        painter.setFont(self._badge_font)
+        painter.setPen(self._text_pen)
+        
+        text_rect = self._badge_text_rects.get(count)
+        if text_rect is None:
+            text_rect = self._badge_metrics.boundingRect(str(count))
+            self._badge_text_rects[count] = text_rect
+        text_x = badge_x + (badge_size - text_rect.width()) // 2
+        text_y = badge_y + (badge_size + text_rect.height()) // 2 - 2
+        
+        painter.drawText(text_x, text_y, str(count))
     
-    def update_animation(self):
-        """Update animation frame"""
-        self.animation_frame += 1
+    def _on_pulse(self, value):
+        """Repaint markers when the pulse crosses into another alpha step"""
+        level = round((value - 0.8) / 0.2 * (self.PULSE_LEVELS - 1))
+        if level == self._pulse_level:
+            return
+        self._pulse_level = level
         if self.markers:
-            self.update()
+            # invalidate only the marker areas, not the whole screen
+            self.update(self._dirty_region)
         else:
-            self.animation_timer.stop()
+            self._pulse.stop()
+    
+    def hideEvent(self, event):
+        """Don't animate what can't be seen"""
+        super().hideEvent(event)
+        if self._pulse.state() == QAbstractAnimation.Running:
+            self._pulse.pause()
     
     def showEvent(self, event):
         """Handle show event"""
         super().showEvent(event)
+        if self._pulse.state() == QAbstractAnimation.Paused:
+            self._pulse.resume()
         # Ensure window stays on top and transparent to input
         self.raise_()
         self.activateWindow()
@@ -216,7 +377,5 @@ class OverlayWindow(QWidget):
         """Handle resize event"""
         super().resizeEvent(event)
         # Ensure overlay covers entire screen when resized
-        screen = QApplication.primaryScreen()
-        screen_geometry = screen.geometry()
-        if self.geometry() != screen_geometry:
-            self.setGeometry(screen_geometry)
+        if self.geometry() != self._screen_geom:
+            self.setGeometry(self._screen_geom)
@@ -5,7 +5,7 @@ Screen region selection widget for defining the monitoring area
 import logging
 from PyQt5.QtWidgets import QWidget, QApplication
 from PyQt5.QtCore import Qt, pyqtSignal, QRect
-from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QCursor
+from PyQt5.QtGui import QPainter, QPen, QColor, QBrush, QCursor, QRegion, QPixmap
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +14,15 @@ class RegionSelector(QWidget):
     
     region_selected = pyqtSignal(tuple)  # Emits (x, y, width, height) or None if cancelled
     
+    # Border pen and corner handles reach this far outside the selection
+    DECORATION_MARGIN = 10
+    
     def __init__(self):
         super().__init__()
         self.selection_active = False
         self.start_pos = None
         self.end_pos = None
+        self._dim_pixmap = None  # pre-rendered dim background
         self.setup_ui()
     
     def setup_ui(self):
@@ -37,6 +41,11 @@ class RegionSelector(QWidget):
         screen = QApplication.primaryScreen()
         screen_geometry = screen.geometry()
         
+        # Render the semi-transparent dim layer once per selection
+        if self._dim_pixmap is None or self._dim_pixmap.size() != screen_geometry.size():
+            self._dim_pixmap = QPixmap(screen_geometry.size())
+            self._dim_pixmap.fill(QColor(0, 0, 0, 100))
+        
         # Make window cover entire screen
         self.setGeometry(screen_geometry)
         self.show()
@@ -59,8 +68,16 @@ class RegionSelector(QWidget):
     def mouseMoveEvent(self, event):
         """Handle mouse move event"""
         if self.selection_active and self.start_pos:
+            old_rect = QRect(self.start_pos, self.end_pos).normalized()
             self.end_pos = event.pos()
-            self.update()
+            new_rect = QRect(self.start_pos, self.end_pos).normalized()
+            
+            # Repaint only the band between old and new selection: the
+            # interior both share (away from either border) is unchanged
+            m = self.DECORATION_MARGIN
+            dirty = (QRegion(old_rect.united(new_rect).adjusted(-m, -m, m, m))
+                     - QRegion(old_rect.intersected(new_rect).adjusted(m, m, -m, -m)))
+            self.update(dirty)
     
     def mouseReleaseEvent(self, event):
         """Handle mouse release event"""
@@ -78,10 +95,11 @@ class RegionSelector(QWidget):
         """Paint the selection rectangle"""
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        # Only the invalidated area needs repainting
+        painter.setClipRegion(event.region())
         
         # Fill entire screen with semi-transparent overlay
-        overlay_color = QColor(0, 0, 0, 100)
-        painter.fillRect(self.rect(), overlay_color)
+        painter.drawPixmap(0, 0, self._dim_pixmap)
         
         # Draw selection rectangle if we have start and end positions
         if self.start_pos and self.end_pos:
@@ -97,31 +115,22 @@ class RegionSelector(QWidget):
             painter.setPen(pen)
             painter.drawRect(selection_rect)
             
-            # Draw corner handles
+            # Draw corner handles, all four in one call
             handle_size = 8
+            half = handle_size // 2
             handle_color = QColor(0, 122, 204)
             painter.setBrush(QBrush(handle_color))
             painter.setPen(Qt.NoPen)
-            
-            # Top-left handle
-            painter.drawRect(selection_rect.left() - handle_size//2, 
-                           selection_rect.top() - handle_size//2, 
-                           handle_size, handle_size)
-            
-            # Top-right handle
-            painter.drawRect(selection_rect.right() - handle_size//2, 
-                           selection_rect.top() - handle_size//2, 
-                           handle_size, handle_size)
-            
-            # Bottom-left handle
-            painter.drawRect(selection_rect.left() - handle_size//2, 
-                           selection_rect.bottom() - handle_size//2, 
-                           handle_size, handle_size)
-            
-            # Bottom-right handle
-            painter.drawRect(selection_rect.right() - handle_size//2, 
-                           selection_rect.bottom() - handle_size//2, 
-                           handle_size, handle_size)
+            painter.drawRects([
+                QRect(selection_rect.left() - half, selection_rect.top() - half,
+                      handle_size, handle_size),      # Top-left
+                QRect(selection_rect.right() - half, selection_rect.top() - half,
+                      handle_size, handle_size),      # Top-right
+                QRect(selection_rect.left() - half, selection_rect.bottom() - half,
+                      handle_size, handle_size),      # Bottom-left
+                QRect(selection_rect.right() - half, selection_rect.bottom() - half,
+                      handle_size, handle_size),      # Bottom-right
+            ])
     
     def finish_selection(self):
         """Complete the selection process"""
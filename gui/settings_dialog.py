@@ -7,11 +7,16 @@ from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout,
                             QPushButton, QLabel, QSpinBox, QLineEdit, QGroupBox,
                             QCheckBox, QComboBox, QColorDialog, QFileDialog,
                             QMessageBox, QTabWidget, QWidget, QSlider)
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QPalette
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtGui import QColor
 
 logger = logging.getLogger(__name__)
 
+# Defaults shared by the widgets and the settings loader/saver
+DEFAULT_WHITELIST = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 "
+DEFAULT_FIRST_COLOR = (255, 165, 0, 180)  # Orange
+DEFAULT_MULT_COLOR = (255, 0, 0, 180)     # Red
+
 class SettingsDialog(QDialog):
     """Settings configuration dialog"""
     
@@ -20,8 +25,7 @@ class SettingsDialog(QDialog):
     def __init__(self, settings_manager, parent=None):
         super().__init__(parent)
         self.settings_manager = settings_manager
-        self.setup_ui()
-        self.load_current_settings()
+        self.setup_ui()  # builds and loads the first tab
         
         logger.info("Settings dialog initialized")
     
@@ -33,25 +37,23 @@ class SettingsDialog(QDialog):
         
         layout = QVBoxLayout(self)
         
-        # Create tab widget
-        tab_widget = QTabWidget()
-        layout.addWidget(tab_widget)
-        
-        # General settings tab
-        general_tab = self.create_general_tab()
-        tab_widget.addTab(general_tab, "General")
-        
-        # OCR settings tab
-        ocr_tab = self.create_ocr_tab()
-        tab_widget.addTab(ocr_tab, "OCR")
-        
-        # Display settings tab
-        display_tab = self.create_display_tab()
-        tab_widget.addTab(display_tab, "Display")
-        
-        # Export settings tab
-        export_tab = self.create_export_tab()
-        tab_widget.addTab(export_tab, "Export")
+        # Create tab widget; only the visible tab is built up front, the
+        # others are built (and loaded) the first time they are selected
+        self.tab_widget = QTabWidget()
+        layout.addWidget(self.tab_widget)
+        
+        self._tab_builders = {
+            0: ("General", self.create_general_tab, self._load_general, self._save_general),
+            1: ("OCR", self.create_ocr_tab, self._load_ocr, self._save_ocr),
+            2: ("Display", self.create_display_tab, self._load_display, self._save_display),
+            3: ("Export", self.create_export_tab, self._load_export, self._save_export),
+        }
+        self._tab_built = set()
+        self._tab_loaded = set()
+        for idx in sorted(self._tab_builders):
+            self.tab_widget.addTab(QWidget(), self._tab_builders[idx][0])
+        self.tab_widget.currentChanged.connect(self._ensure_tab)
+        self._ensure_tab(0)
         
         # Buttons
         button_layout = QHBoxLayout()
@@ -72,6 +74,37 @@ class SettingsDialog(QDialog):
         
         layout.addLayout(button_layout)
     
+    def _ensure_tab(self, idx):
+        """Build tab ``idx`` (replacing its placeholder) and load its values"""
+        if idx in self._tab_built or idx not in self._tab_builders:
+            return
+        self._tab_built.add(idx)
+        name, build, load, _save = self._tab_builders[idx]
+        
+        self.tab_widget.blockSignals(True)
+        try:
+            placeholder = self.tab_widget.widget(idx)
+            self.tab_widget.removeTab(idx)
+            placeholder.deleteLater()
+            self.tab_widget.insertTab(idx, build(), name)
+            self.tab_widget.setCurrentIndex(idx)
+        finally:
+            self.tab_widget.blockSignals(False)
+        
+        # let the tab paint first; fill in its values on the next tick
+        QTimer.singleShot(0, lambda: self._load_tab(idx))
+    
+    def _load_tab(self, idx):
+        """Load stored values into a built tab, once"""
+        if idx in self._tab_loaded:
+            return
+        name, _build, load, _save = self._tab_builders[idx]
+        try:
+            load()
+        except Exception as e:
+            logger.error("Error loading %s settings: %s", name, e)
+        self._tab_loaded.add(idx)
+    
     def create_general_tab(self):
         """Create general settings tab"""
         widget = QWidget()
@@ -138,7 +171,7 @@ class SettingsDialog(QDialog):
         
         ocr_layout.addWidget(QLabel("Character Whitelist:"), 3, 0)
         self.whitelist_edit = QLineEdit()
-        self.whitelist_edit.setText("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 ")
+        self.whitelist_edit.setText(DEFAULT_WHITELIST)
         ocr_layout.addWidget(self.whitelist_edit, 3, 1)
         
         layout.addWidget(ocr_group)
@@ -221,17 +254,30 @@ class SettingsDialog(QDialog):
         color = QColorDialog.getColor(current_color, self, f"Choose {color_type.replace('_', ' ').title()} Color")
         
         if color.isValid():
-            if color_type == 'first_duplicate':
-                self.first_duplicate_color_btn.setStyleSheet(f"background-color: {color.name()}")
-            elif color_type == 'multiple_duplicate':
-                self.multiple_duplicate_color_btn.setStyleSheet(f"background-color: {color.name()}")
+            btn = self._color_button(color_type)
+            if btn is not None:
+                # keep the chosen color on the button; the stylesheet is display only
+                btn.setProperty('color_rgba', (color.red(), color.green(), color.blue(), color.alpha()))
+                btn.setStyleSheet(f"background-color: {color.name()}")
+    
+    def _color_button(self, color_type):
+        """Color button for a color type, or None"""
+        if color_type == 'first_duplicate':
+            return self.first_duplicate_color_btn
+        elif color_type == 'multiple_duplicate':
+            return self.multiple_duplicate_color_btn
+        return None
     
     def get_current_color(self, color_type):
         """Get current color for color type"""
+        btn = self._color_button(color_type)
+        rgba = btn.property('color_rgba') if btn is not None else None
+        if rgba:
+            return QColor(*rgba)
         if color_type == 'first_duplicate':
-            return QColor(255, 165, 0)  # Orange
+            return QColor(*DEFAULT_FIRST_COLOR[:3])
         elif color_type == 'multiple_duplicate':
-            return QColor(255, 0, 0)    # Red
+            return QColor(*DEFAULT_MULT_COLOR[:3])
         return QColor(255, 255, 255)    # Default white
     
     def browse_export_folder(self):
@@ -254,11 +300,15 @@ class SettingsDialog(QDialog):
             # Import the database export function
             from tracker.database import Database
             
-            # Create database instance and export
+            # Create database instance and export; it holds open
+            # connections, so release them once the export is done
             db = Database()
             filename = f"{export_folder}/duplicate_names.csv"
             
-            success = db.export_to_csv(filename)
+            try:
+                success = db.export_to_csv(filename)
+            finally:
+                db.close()
             
             if success:
                 QMessageBox.information(
@@ -266,7 +316,7 @@ class SettingsDialog(QDialog):
                     "Export Complete", 
                     f"Export complete: duplicate_names.csv saved in {export_folder}"
                 )
-                logger.info(f"CSV exported successfully to {filename}")
+                logger.info("CSV exported successfully to %s", filename)
             else:
                 QMessageBox.warning(
                     self, 
@@ -276,7 +326,7 @@ class SettingsDialog(QDialog):
                 logger.error("CSV export failed")
                 
         except Exception as e:
-            logger.error(f"Error during CSV export: {str(e)}")
+            logger.error("Error during CSV export: %s", e)
             QMessageBox.critical(
                 self, 
                 "Export Error", 
@@ -284,73 +334,67 @@ class SettingsDialog(QDialog):
             )
     
     def load_current_settings(self):
-        """Load current settings into the dialog"""
+        """Load current settings into the tabs built so far"""
         try:
-            # General settings
-            self.scan_interval_spin.setValue(self.settings_manager.get_setting('scan_interval', 3))
-            self.hash_threshold_spin.setValue(self.settings_manager.get_setting('hash_threshold', 5))
-            self.scroll_threshold_spin.setValue(self.settings_manager.get_setting('scroll_threshold', 10))
-            
-            # OCR settings
-            self.language_combo.setCurrentText(self.settings_manager.get_setting('ocr_config.language', 'eng'))
-            self.psm_spin.setValue(self.settings_manager.get_setting('ocr_config.psm', 6))
-            self.min_confidence_spin.setValue(self.settings_manager.get_setting('min_confidence', 30))
-            self.whitelist_edit.setText(self.settings_manager.get_setting('ocr_config.whitelist_chars', 
-                                                                        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 '))
-            
-            # Display settings
-            marker_colors = self.settings_manager.get_setting('marker_colors', {})
-            first_color = marker_colors.get('duplicate', [255, 165, 0, 180])
-            multiple_color = marker_colors.get('multiple', [255, 0, 0, 180])
-            
-            self.first_duplicate_color_btn.setStyleSheet(f"background-color: rgb({first_color[0]}, {first_color[1]}, {first_color[2]})")
-            self.multiple_duplicate_color_btn.setStyleSheet(f"background-color: rgb({multiple_color[0]}, {multiple_color[1]}, {multiple_color[2]})")
-            
-            opacity = int(marker_colors.get('duplicate', [255, 165, 0, 180])[3] * 100 / 255)
-            self.opacity_slider.setValue(opacity)
-            
-            # Export settings
-            self.export_folder_edit.setText(self.settings_manager.get_setting('export_folder', ''))
-            self.auto_export_checkbox.setChecked(self.settings_manager.get_setting('auto_export', False))
-            
+            for idx in sorted(self._tab_built):
+                self._tab_builders[idx][2]()
+                self._tab_loaded.add(idx)
         except Exception as e:
-            logger.error(f"Error loading settings: {str(e)}")
+            logger.error("Error loading settings: %s", e)
+    
+    def _load_general(self):
+        """Load general settings"""
+        values = self.settings_manager.get_settings(
+            ['scan_interval', 'hash_threshold', 'scroll_threshold'],
+            defaults={'scan_interval': 3, 'hash_threshold': 5, 'scroll_threshold': 10})
+        self.scan_interval_spin.setValue(values['scan_interval'])
+        self.hash_threshold_spin.setValue(values['hash_threshold'])
+        self.scroll_threshold_spin.setValue(values['scroll_threshold'])
+    
+    def _load_ocr(self):
+        """Load OCR settings"""
+        values = self.settings_manager.get_settings(
+            ['ocr_config.language', 'ocr_config.psm', 'min_confidence', 'ocr_config.whitelist_chars'],
+            defaults={'ocr_config.language': 'eng', 'ocr_config.psm': 6, 'min_confidence': 30,
+                      'ocr_config.whitelist_chars': DEFAULT_WHITELIST})
+        self.language_combo.setCurrentText(values['ocr_config.language'])
+        self.psm_spin.setValue(values['ocr_config.psm'])
+        self.min_confidence_spin.setValue(values['min_confidence'])
+        self.whitelist_edit.setText(values['ocr_config.whitelist_chars'])
+    
+    def _load_display(self):
+        """Load display settings"""
+        marker_colors = self.settings_manager.get_setting('marker_colors', {})
+        first_color = marker_colors.get('duplicate', DEFAULT_FIRST_COLOR)
+        multiple_color = marker_colors.get('multiple', DEFAULT_MULT_COLOR)
+        
+        self.first_duplicate_color_btn.setProperty('color_rgba', tuple(first_color))
+        self.first_duplicate_color_btn.setStyleSheet(f"background-color: rgb({first_color[0]}, {first_color[1]}, {first_color[2]})")
+        self.multiple_duplicate_color_btn.setProperty('color_rgba', tuple(multiple_color))
+        self.multiple_duplicate_color_btn.setStyleSheet(f"background-color: rgb({multiple_color[0]}, {multiple_color[1]}, {multiple_color[2]})")
+        
+        opacity = int(first_color[3] * 100 / 255)
+        self.opacity_slider.setValue(opacity)
+    
+    def _load_export(self):
+        """Load export settings"""
+        values = self.settings_manager.get_settings(
+            ['export_folder', 'auto_export'],
+            defaults={'export_folder': '', 'auto_export': False})
+        self.export_folder_edit.setText(values['export_folder'])
+        self.auto_export_checkbox.setChecked(values['auto_export'])
     
     def save_settings(self):
-        """Save settings from dialog"""
+        """Save settings from dialog
+        
+        Tabs that were never opened (or not loaded yet) are skipped;
+        their stored values are left untouched.
+        """
         try:
-            # General settings
-            self.settings_manager.set_setting('scan_interval', self.scan_interval_spin.value())
-            self.settings_manager.set_setting('hash_threshold', self.hash_threshold_spin.value())
-            self.settings_manager.set_setting('scroll_threshold', self.scroll_threshold_spin.value())
-            
-            # OCR settings
-            self.settings_manager.set_setting('ocr_config.language', self.language_combo.currentText())
-            self.settings_manager.set_setting('ocr_config.psm', self.psm_spin.value())
-            self.settings_manager.set_setting('min_confidence', self.min_confidence_spin.value())
-            self.settings_manager.set_setting('ocr_config.whitelist_chars', self.whitelist_edit.text())
-            
-            # Display settings
-            opacity = self.opacity_slider.value() / 100.0
-            
-            # Get colors from buttons
-            first_color_style = self.first_duplicate_color_btn.styleSheet()
-            multiple_color_style = self.multiple_duplicate_color_btn.styleSheet()
-            
-            # Parse colors (simplified - in production you'd want more robust parsing)
-            first_color = [255, 165, 0, int(255 * opacity)]  # Default orange
-            multiple_color = [255, 0, 0, int(255 * opacity)]  # Default red
-            
-            marker_colors = {
-                'duplicate': first_color,
-                'multiple': multiple_color,
-                'opacity': opacity
-            }
-            self.settings_manager.set_setting('marker_colors', marker_colors)
-            
-            # Export settings
-            self.settings_manager.set_setting('export_folder', self.export_folder_edit.text())
-            self.settings_manager.set_setting('auto_export', self.auto_export_checkbox.isChecked())
+            updates = {}
+            for idx in sorted(self._tab_loaded):
+                updates.update(self._tab_builders[idx][3]())
+            self.settings_manager.set_settings(updates)
             
             # Save to file
             if self.settings_manager.save_settings():
@@ -361,9 +405,50 @@ class SettingsDialog(QDialog):
                 QMessageBox.warning(self, "Error", "Failed to save settings")
                 
         except Exception as e:
-            logger.error(f"Error saving settings: {str(e)}")
+            logger.error("Error saving settings: %s", e)
             QMessageBox.critical(self, "Error", f"Failed to save settings: {str(e)}")
     
+    def _save_general(self):
+        """General settings to store"""
+        return {
+            'scan_interval': self.scan_interval_spin.value(),
+            'hash_threshold': self.hash_threshold_spin.value(),
+            'scroll_threshold': self.scroll_threshold_spin.value(),
+        }
+    
+    def _save_ocr(self):
+        """OCR settings to store"""
+        return {
+            'ocr_config.language': self.language_combo.currentText(),
+            'ocr_config.psm': self.psm_spin.value(),
+            'min_confidence': self.min_confidence_spin.value(),
+            'ocr_config.whitelist_chars': self.whitelist_edit.text(),
+        }
+    
+    def _save_display(self):
+        """Display settings to store"""
+        opacity = self.opacity_slider.value() / 100.0
+        
+        # Get colors from buttons, applying the chosen opacity
+        first_color = list(self.first_duplicate_color_btn.property('color_rgba') or DEFAULT_FIRST_COLOR)
+        multiple_color = list(self.multiple_duplicate_color_btn.property('color_rgba') or DEFAULT_MULT_COLOR)
+        first_color[3] = int(255 * opacity)
+        multiple_color[3] = int(255 * opacity)
+        
+        marker_colors = {
+            'duplicate': first_color,
+            'multiple': multiple_color,
+            'opacity': opacity
+        }
+        return {'marker_colors': marker_colors}
+    
+    def _save_export(self):
+        """Export settings to store"""
+        return {
+            'export_folder': self.export_folder_edit.text(),
+            'auto_export': self.auto_export_checkbox.isChecked(),
+        }
+    
     def reset_to_defaults(self):
         """Reset all settings to defaults"""
         reply = QMessageBox.question(self, "Reset Settings", 
@@ -5,13 +5,12 @@ Main entry point for the application
 """
 import pytesseract
 import sys
-import os
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-import json
-from datetime import datetime
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt
 from gui.main_window import MainWindow
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
@@ -40,16 +39,22 @@ def setup_logging():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
     
-    # Setup root logger
+    # Setup root logger: callers only enqueue records, the file and
+    # console writes happen on the listener's background thread
+    log_queue = queue.Queue(-1)
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(QueueHandler(log_queue))
     
-    return root_logger
+    listener = QueueListener(log_queue, file_handler, console_handler,
+                             respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    return root_logger, listener
 
 # Setup logging
-logger = setup_logging()
+logger, log_listener = setup_logging()
 
 __version__ = '0.2.0'
 
@@ -76,7 +81,7 @@ def main():
         sys.exit(app.exec_())
         
     except Exception as e:
-        logger.error(f"Failed to start application: {str(e)}", exc_info=True)
+        logger.error("Failed to start application: %s", e, exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -8,16 +8,12 @@ setup(
     packages=find_packages(include=['core', 'gui', 'utils', 'core.*', 'gui.*', 'utils.*']),
     install_requires=[
         'PyQt5>=5.15.0',
-        'numpy',
-        'opencv-python',
+        'numpy>=1.21.0',
+        'opencv-python>=4.5.0.62',
         'pillow',
-        'pyautogui',
+        'pyautogui>=0.9.53',
         'imagehash',
-        'pytesseract',
         'pytesseract>=0.3.10',
-        'opencv-python>=4.5.0.62',
-        'pyautogui>=0.9.53',
-        'numpy>=1.21.0',
     ],
     entry_points={
         'console_scripts': [
@@ -28,7 +24,7 @@ setup(
     package_data={
         '': ['*.json', '*.db', '*.png', '*.ico'],
     },
-    python_requires='>=3.7',
+    python_requires='>=3.11',
     classifiers=[
         'Programming Language :: Python :: 3',
         'Operating System :: OS Independent',
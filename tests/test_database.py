@@ -0,0 +1,153 @@
+import unittest
+import os
+import tempfile
+import threading
+from utils.database import NameDatabase
+from tracker.database import Database
+
+class TestNameDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = NameDatabase(os.path.join(self.tmpdir.name, 'names.db'))
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+    def test_add_name_occurrence(self):
+        self.assertEqual(self.db.add_name_occurrence('alice'), 1)
+        self.assertEqual(self.db.add_name_occurrence('alice', 2), 3)
+        self.assertEqual(self.db.get_count('alice'), 3)
+        self.assertEqual(self.db.get_count('bob'), 0)
+    def test_add_name_occurrences_bulk(self):
+        self.db.add_name_occurrence('alice')
+        self.db.add_name_occurrences({'alice': 2, 'bob': 1})
+        self.assertEqual(self.db.get_count('alice'), 3)
+        self.assertEqual(self.db.get_count('bob'), 1)
+        stats = self.db.get_statistics()
+        self.assertEqual(stats['total_names'], 2)
+        self.assertEqual(stats['total_occurrences'], 4)
+        # cached stats are dropped by the next write
+        self.db.add_name_occurrence('carol')
+        self.assertEqual(self.db.get_statistics()['total_names'], 3)
+        # cached counts follow later writes
+        self.db.add_name_occurrences({'bob': 2})
+        self.assertEqual(self.db.get_count('bob'), 3)
+    def test_counts_survive_reopen(self):
+        self.db.add_name_occurrences({'alice': 2})
+        self.db.close()
+        self.db = NameDatabase(os.path.join(self.tmpdir.name, 'names.db'))
+        self.assertEqual(self.db.get_count('alice'), 2)
+        self.db.clear_all()
+        self.assertEqual(self.db.get_count('alice'), 0)
+
+    def test_sees_writes_from_other_connections(self):
+        self.db.SYNC_INTERVAL = 0  # check on every call
+        self.assertEqual(self.db.get_count('alice'), 0)
+        other = NameDatabase(os.path.join(self.tmpdir.name, 'names.db'))
+        try:
+            other.add_name_occurrence('alice', 2)
+        finally:
+            other.close()
+        self.assertEqual(self.db.get_count('alice'), 2)
+        self.assertEqual(self.db.get_statistics()['total_names'], 1)
+
+    def test_cached_counts_follow_other_connections(self):
+        self.db.SYNC_INTERVAL = 0  # check on every call
+        self.db.add_name_occurrence('alice')
+        self.assertEqual(self.db.get_count('alice'), 1)
+        other = NameDatabase(os.path.join(self.tmpdir.name, 'names.db'))
+        try:
+            other.add_name_occurrence('alice', 2)
+        finally:
+            other.close()
+        self.assertEqual(self.db.get_count('alice'), 3)
+
+    def test_cached_counts_skip_sqlite_between_syncs(self):
+        self.db.add_name_occurrence('alice')
+        statements = []
+        self.db._conn.set_trace_callback(statements.append)
+        self.assertEqual(self.db.get_count('alice'), 1)
+        self.assertEqual(self.db.get_count('bob'), 0)
+        self.assertEqual([sql for sql in statements if 'SELECT' in sql or 'PRAGMA' in sql], [])
+        # once the window has passed, other connections' writes show up
+        other = NameDatabase(os.path.join(self.tmpdir.name, 'names.db'))
+        try:
+            other.add_name_occurrence('bob')
+        finally:
+            other.close()
+        self.db._synced_at = float('-inf')
+        self.assertEqual(self.db.get_count('bob'), 1)
+
+class TestTrackerDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'tracker.db'))
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+    def test_record_names_batch(self):
+        self.db.record_names(['alice', 'bob', 'alice'], [1, 2, 3], session_id='s1')
+        self.db.add_name_occurrences({'bob': 1, 'carol': 1})
+        self.assertEqual(self.db.get_total_count('alice'), 4)
+        self.assertEqual(self.db.get_total_count('bob'), 3)
+        self.assertEqual(self.db.get_total_count('carol'), 1)
+        stats = self.db.get_stats()
+        self.assertEqual(stats['unique_names'], 3)
+        self.assertEqual(stats['total_occurrences'], 8)
+        self.assertEqual(stats['duplicate_names'], 2)
+        # repeats within one batch collapse to a single occurrence row
+        rows = self.db._conn.execute("SELECT COUNT(*) FROM name_occurrences").fetchone()[0]
+        self.assertEqual(rows, 4)
+
+    def test_add_name_occurrence_single(self):
+        self.db.add_name_occurrence('alice', 2, session_id='s1')
+        self.db.add_name_occurrence('alice')
+        self.assertEqual(self.db.get_total_count('alice'), 3)
+        rows = self.db._conn.execute(
+            "SELECT COUNT(DISTINCT name_id), COUNT(*) FROM name_occurrences").fetchone()
+        self.assertEqual(rows, (1, 2))
+
+    def test_reads_from_other_threads(self):
+        self.db.add_name_occurrences({'alice': 2})
+        results = []
+        worker = threading.Thread(target=lambda: results.append(self.db.get_total_count('alice')))
+        worker.start()
+        worker.join()
+        self.assertEqual(results, [2])
+        # a reader sees writes committed after it was opened
+        self.assertEqual(self.db.get_total_count('alice'), 2)
+        self.db.add_name_occurrence('alice')
+        self.assertEqual(self.db.get_total_count('alice'), 3)
+
+    def test_cached_queries_refresh_after_writes(self):
+        self.db.add_name_occurrences({'alice': 2, 'bob': 1})
+        self.assertEqual(self.db.get_stats()['unique_names'], 2)
+        self.assertEqual([d['name'] for d in self.db.get_duplicates()], ['alice'])
+        self.db.add_name_occurrence('bob')
+        self.assertEqual(self.db.get_stats()['duplicate_names'], 2)
+        self.assertEqual(len(self.db.get_duplicates()), 2)
+        self.db.clear_all()
+        self.assertEqual(self.db.get_stats()['unique_names'], 0)
+        self.assertEqual(self.db.get_duplicates(), [])
+
+    def test_record_names_large_batch(self):
+        # more unique names than SQLite's minimum host-parameter limit (999)
+        names = ['name%d' % i for i in range(1500)]
+        self.db.record_names(names)
+        self.assertEqual(self.db.get_stats()['unique_names'], 1500)
+        rows = self.db._conn.execute("SELECT COUNT(*) FROM name_occurrences").fetchone()[0]
+        self.assertEqual(rows, 1500)
+
+    def test_cached_queries_see_other_instances(self):
+        self.db.add_name_occurrences({'alice': 1})
+        self.assertEqual(self.db.get_stats()['unique_names'], 1)
+        self.assertEqual(self.db.get_duplicates(), [])
+        other = Database(os.path.join(self.tmpdir.name, 'tracker.db'))
+        try:
+            other.add_name_occurrences({'alice': 1, 'bob': 1})
+        finally:
+            other.close()
+        self.assertEqual(self.db.get_stats()['unique_names'], 2)
+        self.assertEqual([d['name'] for d in self.db.get_duplicates()], ['alice'])
+
+if __name__ == '__main__':
+    unittest.main()
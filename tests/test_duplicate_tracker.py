@@ -1,14 +1,13 @@
 import unittest
+from collections import defaultdict
 from tracker.duplicate_tracker import DuplicateTracker
 
 class MockDatabase:
+    __slots__ = ('names',)
     def __init__(self):
-        self.names = {}
+        self.names = defaultdict(int)
     def add_name_occurrence(self, name, count=1):
-        if name in self.names:
-            self.names[name] += count
-        else:
-            self.names[name] = count
+        self.names[name] += count
     def get_name_count(self, name):
         return self.names.get(name, 0)
     def get_statistics(self):
@@ -35,7 +34,52 @@ class TestDuplicateTracker(unittest.TestCase):
         ]
         dups2 = self.tracker.process_names(names2)
         self.assertTrue(any(d['name'] == 'alice' for d in dups2))
-        self.assertEqual(self.db.get_name_count('alice'), 3)
+        # The Alice still at y=0 is the first scan's occurrence; only one is new
+        self.assertEqual(self.db.get_name_count('alice'), 2)
+    def test_process_names_matches_process(self):
+        alice = {'name': 'Alice', 'x': 0, 'y': 0, 'width': 10, 'height': 10, 'confidence': 90}
+        jitter = dict(alice, x=1, y=2)
+        bob = {'name': 'Bob', 'x': 0, 'y': 20, 'width': 10, 'height': 10, 'confidence': 90}
+        other = DuplicateTracker(MockDatabase())
+        for scan in ([alice, jitter], [alice, bob], [bob], [alice, bob]):
+            self.tracker.process_names(scan)
+            other.process(scan)
+        self.assertEqual(self.db.get_name_count('alice'), 2)
+        self.assertEqual(self.db.get_name_count('bob'), 1)
+        self.assertEqual(dict(self.tracker.session_counts),
+                         {name.lower(): count for name, count in other.session_counts.items()})
+    def test_process_drops_jittered_repeats(self):
+        results = [
+            {'name': 'Alice', 'x': 0, 'y': 0, 'width': 10, 'height': 10, 'confidence': 90},
+            {'name': 'Alice', 'x': 1, 'y': 2, 'width': 10, 'height': 10, 'confidence': 90},
+            {'name': 'Alice', 'x': 0, 'y': 40, 'width': 10, 'height': 10, 'confidence': 90},
+        ]
+        self.tracker.process(results)
+        self.assertEqual(self.db.get_name_count('Alice'), 2)
+
+    def test_process_counts_only_new_entries(self):
+        alice = {'name': 'Alice', 'x': 0, 'y': 0, 'width': 10, 'height': 10, 'confidence': 90}
+        bob = {'name': 'Bob', 'x': 0, 'y': 20, 'width': 10, 'height': 10, 'confidence': 90}
+        self.tracker.process([alice])
+        # Alice is still on screen: no new occurrence, Bob is new
+        self.tracker.process([alice, bob])
+        self.assertEqual(self.db.get_name_count('Alice'), 1)
+        self.assertEqual(self.db.get_name_count('Bob'), 1)
+        self.assertEqual(self.tracker.get_duplicate_names(), [])
+        # Alice scrolled away and came back
+        self.tracker.process([bob])
+        self.tracker.process([alice, bob])
+        self.assertEqual(self.tracker.get_duplicate_names(), [('Alice', 2)])
+
+    def test_empty_frames_clear_markers_once(self):
+        calls = []
+        class RecordingOverlay:
+            def update_markers(self, boxes):
+                calls.append(list(boxes))
+        tracker = DuplicateTracker(self.db, RecordingOverlay())
+        tracker.process([])
+        tracker.process([])
+        self.assertEqual(calls, [[]])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageOps
+from utils.image_utils import ImageUtils
+
+
+def pil_enhance_for_ocr(image):
+    """The original PIL enhancement pipeline (minus its contrast step, which
+    the final auto-level largely subsumes)"""
+    image = ImageEnhance.Sharpness(image.convert('L')).enhance(1.2)
+    image = image.filter(ImageFilter.UnsharpMask(radius=1, percent=150, threshold=2))
+    return ImageOps.autocontrast(image, cutoff=1)
+
+
+class TestImageUtils(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        text = Image.new('L', (200, 60), 230)
+        draw = ImageDraw.Draw(text)
+        draw.text((10, 10), "Alice Johnson", fill=30)
+        draw.text((10, 30), "Bob Smith 42", fill=60)
+        rng = np.random.default_rng(0)
+        noise = rng.integers(-8, 9, (60, 200))
+        noisy = np.clip(np.asarray(text).astype(int) + noise, 0, 255).astype(np.uint8)
+        cls.images = [text, Image.fromarray(noisy)]
+
+    def test_enhance_for_ocr_matches_pil_pipeline(self):
+        for image in self.images:
+            with self.subTest(image=image):
+                expected = np.asarray(pil_enhance_for_ocr(image)).astype(int)
+                actual = np.asarray(ImageUtils.enhance_for_ocr(image)).astype(int)
+                self.assertEqual(actual.shape, expected.shape)
+                diff = np.abs(actual - expected)
+                self.assertLess(diff.mean(), 2.0)
+                self.assertLessEqual(np.percentile(diff, 99), 6)
+
+    def test_enhance_and_threshold_matches_two_step(self):
+        for image in self.images + [Image.new('L', (40, 20), 128)]:
+            for threshold in (0, 64, 128, 200, 255):
+                with self.subTest(size=image.size, threshold=threshold):
+                    expected = ImageUtils.apply_threshold(
+                        ImageUtils.enhance_for_ocr(image), threshold)
+                    actual = ImageUtils.enhance_and_threshold(image, threshold)
+                    self.assertEqual(actual.mode, '1')
+                    np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+        self.assertIsNone(ImageUtils.enhance_and_threshold(None))
+
+    def test_enhance_for_ocr_batch_matches_single(self):
+        # More same-sized images than one channel stack holds, mixed
+        # with other sizes, colour images and None entries
+        rng = np.random.default_rng(2)
+        small = [Image.fromarray(rng.integers(0, 256, (16, 24), dtype=np.uint8))
+                 for _ in range(600)]
+        images = (small[:300] + [None] + self.images + [self.images[0].convert('RGB')]
+                  + small[300:] + [None])
+        results = ImageUtils.enhance_for_ocr_batch(images)
+        self.assertEqual(len(results), len(images))
+        for image, result in zip(images, results):
+            if image is None:
+                self.assertIsNone(result)
+            else:
+                np.testing.assert_array_equal(np.asarray(result),
+                                              np.asarray(ImageUtils.enhance_for_ocr(image)))
+
+    def test_create_thumbnail(self):
+        for inplace in (False, True):
+            for src_size in ((1600, 400), (300, 120)):
+                with self.subTest(inplace=inplace, size=src_size):
+                    image = Image.new('RGB', src_size, 'white')
+                    thumb = ImageUtils.create_thumbnail(image, (150, 150), inplace=inplace)
+                    self.assertEqual(thumb.width, 150)
+                    self.assertLessEqual(thumb.height, 150)
+                    self.assertIs(thumb is image, inplace)
+                    self.assertEqual(image.size, thumb.size if inplace else src_size)
+
+    def test_save_debug_image_matches_pil_contrast(self):
+        dark = Image.fromarray((np.asarray(self.images[1]) // 4).astype(np.uint8))
+        with tempfile.TemporaryDirectory() as tmp:
+            for image in self.images + [dark, self.images[0].convert('RGB')]:
+                with self.subTest(mode=image.mode, mean=np.asarray(image).mean()):
+                    path = os.path.join(tmp, 'debug.png')
+                    self.assertTrue(ImageUtils.save_debug_image(image, path))
+                    expected = ImageEnhance.Contrast(image.convert('L')).enhance(2.0)
+                    with Image.open(path) as saved:
+                        np.testing.assert_array_equal(np.asarray(saved), np.asarray(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
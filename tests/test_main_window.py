@@ -0,0 +1,67 @@
+"""
+Unit tests for MainWindow's scan-result handling
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from gui.main_window import MainWindow, _to_ocr_array
+from tracker.database import Database
+from tracker.duplicate_tracker import DuplicateTracker
+
+
+def _token(text, x, y):
+    return {'name': text, 'x': x, 'y': y, 'width': 40, 'height': 12}
+
+
+class TestScanCompleted(unittest.TestCase):
+    """on_scan_completed driven on a stand-in window with a real database"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.database = Database(os.path.join(self._tmp.name, 'names.db'))
+        self.window = Mock()
+        self.window._last_names_sig = None
+        self.window.database = self.database
+        self.window.duplicate_tracker = DuplicateTracker(self.database, session_id='s1')
+
+    def tearDown(self):
+        self.database.close()
+        self._tmp.cleanup()
+
+    def scan(self, tokens, scroll_info=None):
+        MainWindow.on_scan_completed(self.window, _to_ocr_array(tokens), scroll_info)
+
+    def test_each_name_is_written_once(self):
+        self.scan([_token('Alice', 0, 0), _token('Bob', 0, 20)])
+        self.scan([_token('Alice', 0, 0), _token('Bob', 0, 20), _token('Alice', 0, 40)])
+        rows = {row['name']: row['total_occurrences'] for row in self.database.get_all_seen()}
+        self.assertEqual(rows, {'alice': 2, 'bob': 1})
+        self.assertEqual([row['name'] for row in self.database.get_duplicates()], ['alice'])
+        stats = self.database.get_stats()
+        self.assertEqual(stats['unique_names'], 2)
+        self.assertEqual(stats['total_occurrences'], 3)
+        self.window._set_status.assert_called_with("Session: 2 names, 3 occurrences")
+        self.window.screen_capture.capture_and_process.assert_not_called()
+
+    def test_moved_names_update_the_overlay(self):
+        self.scan([_token('Alice', 0, 0), _token('Alice', 0, 40)])
+        self.window._queue_markers.reset_mock()
+        self.scan([_token('Alice', 0, 60), _token('Alice', 0, 100)])
+        duplicates = self.window._queue_markers.call_args[0][0]
+        self.assertEqual([p['y'] for p in duplicates[0]['positions']], [60, 100])
+
+    def test_unchanged_frame_still_applies_scroll(self):
+        tokens = [_token('Alice', 0, 0), _token('Alice', 0, 40)]
+        self.scan(tokens)
+        self.window._queue_markers.reset_mock()
+        self.scan(tokens, {'direction': 'down', 'magnitude': 5, 'confidence': 0.9})
+        self.window._queue_markers.assert_not_called()
+        history = self.window.duplicate_tracker.position_history['alice']
+        self.assertEqual([p['y'] for p in history], [-5, 35])
+
+
+if __name__ == '__main__':
+    unittest.main()
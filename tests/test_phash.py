@@ -1,24 +1,66 @@
 import unittest
-from PIL import Image, ImageChops
+from PIL import Image, ImageFilter, ImageOps
 import imagehash
 import numpy as np
+from utils.image_utils import fast_phash
+
 
 class TestPhashDifference(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The blank image's hash never changes; compute it once
+        cls._white_phash = imagehash.phash(Image.new('RGB', (64, 64), 'white'))
+
+    @staticmethod
+    def _textured(seed):
+        """128x128 blurred random greyscale image stretched to full range"""
+        rng = np.random.default_rng(seed)
+        img = Image.fromarray(rng.integers(0, 256, (128, 128), dtype=np.uint8))
+        return ImageOps.autocontrast(img.filter(ImageFilter.GaussianBlur(6)))
+
     def setUp(self):
         # Create two simple images
-        self.img1 = Image.new('RGB', (64, 64), color='white')
-        self.img2 = Image.new('RGB', (64, 64), color='white')
+        arr = np.full((64, 64, 3), 255, np.uint8)
+        self.img1 = Image.fromarray(arr, 'RGB')
         # Draw a black rectangle on img2
-        for x in range(20, 44):
-            for y in range(20, 44):
-                self.img2.putpixel((x, y), (0, 0, 0))
+        arr = arr.copy()
+        arr[20:44, 20:44] = 0
+        self.img2 = Image.fromarray(arr, 'RGB')
 
     def test_phash_difference(self):
-        hash1 = imagehash.phash(self.img1)
+        hash1 = self._white_phash
         hash2 = imagehash.phash(self.img2)
-        diff = hash1 - hash2
+        # Hamming distance via a single XOR + popcount on the packed bits
+        diff = (int(str(hash1), 16) ^ int(str(hash2), 16)).bit_count()
         self.assertTrue(diff > 0)
         self.assertIsInstance(diff, int)
+        self.assertEqual(diff, hash1 - hash2)
+
+    def test_fast_phash_matches_imagehash(self):
+        # Smooth textured images: flat ones leave near-zero coefficients whose
+        # bits depend on floating-point rounding rather than content
+        images = [self._textured(seed) for seed in range(4)]
+        hashes = [fast_phash(np.asarray(img)) for img in images]
+        # Area resampling instead of imagehash's Lanczos may flip a few
+        # borderline bits, but stays well under the change threshold
+        for img, h in zip(images, hashes):
+            ref = int(str(imagehash.phash(img, hash_size=8)), 16)
+            self.assertLessEqual((h ^ ref).bit_count(), 4)
+        for h1 in hashes[1:]:
+            self.assertGreater((hashes[0] ^ h1).bit_count(), 5)
+
+    def test_fast_phash_ignores_noise_and_scale(self):
+        img = self._textured(0)
+        arr = np.asarray(img)
+        noise = np.random.default_rng(1).integers(-5, 6, arr.shape)
+        noisy = np.clip(arr + noise, 0, 255).astype(np.uint8)
+        half = np.asarray(img.resize((64, 64), Image.LANCZOS))
+        h = fast_phash(arr)
+        self.assertLessEqual((h ^ fast_phash(noisy)).bit_count(), 2)
+        self.assertLessEqual((h ^ fast_phash(half)).bit_count(), 2)
+        self.assertGreater((fast_phash(np.asarray(self.img1.convert('L')))
+                            ^ fast_phash(np.asarray(self.img2.convert('L')))).bit_count(), 0)
+
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -14,14 +14,20 @@ from core.scroll_tracker import ScrollTracker
 class TestScrollTracker(unittest.TestCase):
     """Test cases for ScrollTracker class"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests"""
+        # White test images are never modified, so build them once
+        cls._blank = np.full((200, 100, 3), 255, np.uint8)
+        cls.test_image1 = Image.fromarray(cls._blank)
+        cls.test_image2 = Image.fromarray(cls._blank.copy())
+        # adjust_marker_positions is stateless, so one tracker serves every case
+        cls.shared_tracker = ScrollTracker(scroll_threshold=10, correlation_threshold=0.7)
+    
     def setUp(self):
-        """Set up test fixtures"""
+        """Set up a fresh tracker; it holds per-test state such as last_image"""
         self.scroll_tracker = ScrollTracker(scroll_threshold=10, correlation_threshold=0.7)
         
-        # Create test images
-        self.test_image1 = Image.new('RGB', (100, 200), color='white')
-        self.test_image2 = Image.new('RGB', (100, 200), color='white')
-        
     def test_initialization(self):
         """Test ScrollTracker initialization"""
         tracker = ScrollTracker()
@@ -72,50 +78,50 @@ class TestScrollTracker(unittest.TestCase):
             self.assertEqual(result['direction'], 'up')
             self.assertGreater(result['confidence'], 0.7)
         
-    def test_adjust_marker_positions_down(self):
-        """Test marker position adjustment for scroll down"""
-        markers = [
-            {'x': 10, 'y': 50, 'width': 20, 'height': 10},
-            {'x': 30, 'y': 100, 'width': 25, 'height': 15}
-        ]
-        scroll_info = {'direction': 'down', 'magnitude': 20}
-        
-        adjusted = self.scroll_tracker.adjust_marker_positions(markers, scroll_info)
-        
-        self.assertEqual(len(adjusted), 2)
-        self.assertEqual(adjusted[0]['y'], 30)  # 50 - 20
-        self.assertEqual(adjusted[1]['y'], 80)  # 100 - 20
-        
-    def test_adjust_marker_positions_up(self):
-        """Test marker position adjustment for scroll up"""
-        markers = [
-            {'x': 10, 'y': 50, 'width': 20, 'height': 10},
-            {'x': 30, 'y': 100, 'width': 25, 'height': 15}
-        ]
-        scroll_info = {'direction': 'up', 'magnitude': 15}
-        
-        adjusted = self.scroll_tracker.adjust_marker_positions(markers, scroll_info)
-        
-        self.assertEqual(len(adjusted), 2)
-        self.assertEqual(adjusted[0]['y'], 65)  # 50 + 15
-        self.assertEqual(adjusted[1]['y'], 115)  # 100 + 15
-        
-    def test_adjust_marker_positions_scrolled_out(self):
-        """Test that markers scrolled out of view are removed"""
-        markers = [
-            {'x': 10, 'y': 10, 'width': 20, 'height': 10},  # Will be scrolled out
-            {'x': 30, 'y': 100, 'width': 25, 'height': 15}  # Will remain visible
-        ]
-        scroll_info = {'direction': 'down', 'magnitude': 50}
+    # (direction, magnitude, markers, expected y values after adjustment)
+    ADJUST_CASES = [
+        # Scroll down: markers move up
+        ('down', 20,
+         [{'x': 10, 'y': 50, 'width': 20, 'height': 10},
+          {'x': 30, 'y': 100, 'width': 25, 'height': 15}],
+         [30, 80]),
+        # Scroll up: markers move down
+        ('up', 15,
+         [{'x': 10, 'y': 50, 'width': 20, 'height': 10},
+          {'x': 30, 'y': 100, 'width': 25, 'height': 15}],
+         [65, 115]),
+        # First marker ends at y + height = -30 > -50 (tolerance), so both remain
+        ('down', 50,
+         [{'x': 10, 'y': 10, 'width': 20, 'height': 10},
+          {'x': 30, 'y': 100, 'width': 25, 'height': 15}],
+         [-40, 50]),
+        # First marker ends at y + height = -50, past the tolerance, so it is dropped
+        ('down', 70,
+         [{'x': 10, 'y': 10, 'width': 20, 'height': 10},
+          {'x': 30, 'y': 100, 'width': 25, 'height': 15}],
+         [30]),
+    ]
+    
+    def test_adjust_marker_positions(self):
+        """Test marker position adjustment for scroll up/down and scrolled-out markers"""
+        for direction, magnitude, markers, expected_ys in self.ADJUST_CASES:
+            with self.subTest(direction=direction, magnitude=magnitude):
+                scroll_info = {'direction': direction, 'magnitude': magnitude}
+                adjusted = self.shared_tracker.adjust_marker_positions(markers, scroll_info)
+                self.assertEqual([m['y'] for m in adjusted], expected_ys)
+        
+    def test_get_small_gray_downsamples_and_caches(self):
+        """Small grayscale frame is downsampled and reused for the same image"""
+        image = Image.new('RGB', (512, 256), color='white')
+        self.scroll_tracker.last_image = self.test_image1
+        self.scroll_tracker.detect_scroll(Image.new('RGB', (100, 200), color='white'))
         
-        adjusted = self.scroll_tracker.adjust_marker_positions(markers, scroll_info)
+        small = self.scroll_tracker.get_small_gray(image)
+        self.assertEqual(small.shape, (32, 64))  # factor 8, capped at 32px
         
-        # The first marker: y = 10 - 50 = -40, height = 10, so y + height = -30 > -50 (tolerance)
-        # The second marker: y = 100 - 50 = 50, height = 15, so y + height = 65 > -50
-        # Both markers should remain visible due to the -50 tolerance
-        self.assertEqual(len(adjusted), 2)  # Both markers should remain
-        self.assertEqual(adjusted[0]['y'], -40)  # 10 - 50
-        self.assertEqual(adjusted[1]['y'], 50)   # 100 - 50
+        frame = self.scroll_tracker.last_image
+        self.assertIs(self.scroll_tracker.get_small_gray(frame),
+                      self.scroll_tracker.get_small_gray(frame))
         
     def test_track_ocr_results_no_previous(self):
         """Test OCR tracking with no previous results"""
@@ -18,13 +18,23 @@ class TestSettingsDialog(unittest.TestCase):
     
     @classmethod
     def setUpClass(cls):
-        """Set up QApplication for testing"""
-        cls.app = QApplication([])
+        """Set up QApplication and one shared dialog for testing"""
+        cls.app = QApplication.instance() or QApplication([])
+        cls.settings_manager = SettingsManager()
+        cls.dialog = SettingsDialog(cls.settings_manager)
+        # tabs are built on first selection; the export tests need that one
+        cls.dialog._ensure_tab(3)
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.tmp_path = cls._tmp.name
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.dialog.deleteLater()
+        cls._tmp.cleanup()
     
     def setUp(self):
-        """Set up test fixtures"""
-        self.settings_manager = SettingsManager()
-        self.dialog = SettingsDialog(self.settings_manager)
+        """Reset the dialog state individual tests modify"""
+        self.dialog.export_folder_edit.setText('')
         
     def test_initialization(self):
         """Test SettingsDialog initialization"""
@@ -32,6 +42,16 @@ class TestSettingsDialog(unittest.TestCase):
         self.assertEqual(self.dialog.windowTitle(), "Settings")
         self.assertTrue(self.dialog.isModal())
         
+    def test_tabs_built_lazily(self):
+        """Only the first tab is built until another one is selected"""
+        dialog = SettingsDialog(self.settings_manager)
+        self.assertEqual(dialog._tab_built, {0})
+        self.assertFalse(hasattr(dialog, 'language_combo'))
+        dialog.tab_widget.setCurrentIndex(1)
+        self.assertIn(1, dialog._tab_built)
+        self.assertTrue(hasattr(dialog, 'language_combo'))
+        self.assertEqual(dialog.tab_widget.count(), 4)
+        
     def test_export_csv_button_exists(self):
         """Test that Export CSV button exists in the dialog"""
         self.assertIsNotNone(self.dialog.export_csv_btn)
@@ -42,51 +62,51 @@ class TestSettingsDialog(unittest.TestCase):
     @patch('tracker.database.Database')
     def test_export_csv_success(self, mock_db_class, mock_message_box, mock_file_dialog):
         """Test successful CSV export"""
-        # Mock file dialog to return a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            mock_file_dialog.return_value = temp_dir
-            
-            # Mock database export to return success
-            mock_db = Mock()
-            mock_db.export_to_csv.return_value = True
-            mock_db_class.return_value = mock_db
-            
-            # Call export_csv method
-            self.dialog.export_csv()
-            
-            # Verify database export was called
-            mock_db.export_to_csv.assert_called_once()
-            call_args = mock_db.export_to_csv.call_args[0][0]
-            self.assertIn('duplicate_names.csv', call_args)
-            self.assertIn(temp_dir, call_args)
-            
-            # Verify success message was shown
-            mock_message_box.assert_called_once()
-            call_args = mock_message_box.call_args
-            self.assertEqual(call_args[0][1], "Export Complete")
-            
+        # Mock file dialog to return the shared temporary directory
+        temp_dir = self.tmp_path
+        mock_file_dialog.return_value = temp_dir
+        
+        # Mock database export to return success
+        mock_db = Mock()
+        mock_db.export_to_csv.return_value = True
+        mock_db_class.return_value = mock_db
+        
+        # Call export_csv method
+        self.dialog.export_csv()
+        
+        # Verify database export was called
+        mock_db.export_to_csv.assert_called_once()
+        call_args = mock_db.export_to_csv.call_args[0][0]
+        self.assertIn('duplicate_names.csv', call_args)
+        self.assertIn(temp_dir, call_args)
+        
+        # Verify success message was shown
+        mock_message_box.assert_called_once()
+        call_args = mock_message_box.call_args
+        self.assertEqual(call_args[0][1], "Export Complete")
+        
     @patch('gui.settings_dialog.QFileDialog.getExistingDirectory')
     @patch('gui.settings_dialog.QMessageBox.warning')
     @patch('tracker.database.Database')
     def test_export_csv_failure(self, mock_db_class, mock_message_box, mock_file_dialog):
         """Test failed CSV export"""
-        # Mock file dialog to return a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            mock_file_dialog.return_value = temp_dir
-            
-            # Mock database export to return failure
-            mock_db = Mock()
-            mock_db.export_to_csv.return_value = False
-            mock_db_class.return_value = mock_db
-            
-            # Call export_csv method
-            self.dialog.export_csv()
-            
-            # Verify failure message was shown
-            mock_message_box.assert_called_once()
-            call_args = mock_message_box.call_args
-            self.assertEqual(call_args[0][1], "Export Failed")
-            
+        # Mock file dialog to return the shared temporary directory
+        temp_dir = self.tmp_path
+        mock_file_dialog.return_value = temp_dir
+        
+        # Mock database export to return failure
+        mock_db = Mock()
+        mock_db.export_to_csv.return_value = False
+        mock_db_class.return_value = mock_db
+        
+        # Call export_csv method
+        self.dialog.export_csv()
+        
+        # Verify failure message was shown
+        mock_message_box.assert_called_once()
+        call_args = mock_message_box.call_args
+        self.assertEqual(call_args[0][1], "Export Failed")
+        
     @patch('gui.settings_dialog.QFileDialog.getExistingDirectory')
     def test_export_csv_no_folder_selected(self, mock_file_dialog):
         """Test CSV export when no folder is selected"""
@@ -104,21 +124,21 @@ class TestSettingsDialog(unittest.TestCase):
     @patch('tracker.database.Database')
     def test_export_csv_exception(self, mock_db_class, mock_message_box, mock_file_dialog):
         """Test CSV export with exception handling"""
-        # Mock file dialog to return a temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            mock_file_dialog.return_value = temp_dir
-            
-            # Mock database to raise an exception
-            mock_db_class.side_effect = Exception("Database error")
-            
-            # Call export_csv method
-            self.dialog.export_csv()
-            
-            # Verify error message was shown
-            mock_message_box.assert_called_once()
-            call_args = mock_message_box.call_args
-            self.assertEqual(call_args[0][1], "Export Error")
-            
+        # Mock file dialog to return the shared temporary directory
+        temp_dir = self.tmp_path
+        mock_file_dialog.return_value = temp_dir
+        
+        # Mock database to raise an exception
+        mock_db_class.side_effect = Exception("Database error")
+        
+        # Call export_csv method
+        self.dialog.export_csv()
+        
+        # Verify error message was shown
+        mock_message_box.assert_called_once()
+        call_args = mock_message_box.call_args
+        self.assertEqual(call_args[0][1], "Export Error")
+        
     def test_export_csv_with_existing_folder(self):
         """Test CSV export when export folder is already set"""
         # Set export folder in the dialog
@@ -1,17 +1,10 @@
 import unittest
-import os
-import json
+import io
 from core.settings_manager import SettingsManager
 
 class TestSettingsManager(unittest.TestCase):
     def setUp(self):
-        self.test_file = 'test_settings.json'
-        # Remove if exists
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
-    def tearDown(self):
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        self.test_file = io.BytesIO()
     def test_load_defaults(self):
         sm = SettingsManager(settings_file=self.test_file)
         self.assertIn('scan_interval', sm.settings)
@@ -22,6 +15,20 @@ class TestSettingsManager(unittest.TestCase):
         sm.save_settings()
         sm2 = SettingsManager(settings_file=self.test_file)
         self.assertEqual(sm2.get_setting('scan_interval'), 7)
+    def test_bulk_get_and_set(self):
+        sm = SettingsManager(settings_file=self.test_file)
+        sm.set_settings({'scan_interval': 9, 'ocr_config.psm': 4})
+        values = sm.get_settings(['scan_interval', 'ocr_config.psm', 'missing'],
+                                 defaults={'missing': 'x'})
+        self.assertEqual(values, {'scan_interval': 9, 'ocr_config.psm': 4, 'missing': 'x'})
+    def test_nested_lookup_cache_invalidated(self):
+        sm = SettingsManager(settings_file=self.test_file)
+        self.assertEqual(sm.get_setting('ocr_config.psm'), 6)
+        self.assertEqual(sm.get_setting('ocr_config.nope', 'd'), 'd')
+        sm.set_setting('ocr_config.psm', 11)
+        self.assertEqual(sm.get_setting('ocr_config.psm'), 11)
+        sm.set_setting('ocr_config.nope', 1)
+        self.assertEqual(sm.get_setting('ocr_config.nope', 'd'), 1)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
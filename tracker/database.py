@@ -11,14 +11,68 @@ from typing import List, Tuple, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Hot statements kept as module constants so the connection's statement
+# cache always sees the same text and skips re-parsing
+_SQL_UPSERT_SEEN = """
+    INSERT INTO seen_names
+        (name, first_seen_ts, last_seen_ts, total_occurrences)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(name) DO UPDATE
+       SET last_seen_ts = excluded.last_seen_ts,
+           total_occurrences = total_occurrences + excluded.total_occurrences
+"""
+# single-name variant: RETURNING (SQLite >= 3.35) hands back the row id, so
+# no follow-up SELECT is needed
+_SQL_UPSERT_SEEN_RETURNING = _SQL_UPSERT_SEEN.rstrip() + "\n    RETURNING id\n"
+_SQL_INSERT_OCCURRENCE = """
+    INSERT INTO name_occurrences
+        (name_id, ts, count, session_id)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_SELECT_TOTAL = "SELECT total_occurrences FROM seen_names WHERE name = ?"
+
+
+# Largest IN list per id lookup; a power of two below SQLite's historic
+# 999-variable limit (SQLITE_MAX_VARIABLE_NUMBER before 3.32)
+_ID_LOOKUP_CHUNK = 512
+
+
+def _sql_select_ids(n: int) -> str:
+    """SELECT name, id for ``n`` names; n is a power of two so plans get reused."""
+    return "SELECT name, id FROM seen_names WHERE name IN (%s)" % ",".join("?" * n)
+
+
 class Database:
     """SQLite database manager for duplicate name tracking"""
 
+    # refresh planner statistics after this many write batches
+    OPTIMIZE_EVERY = 500
+
     def __init__(self, db_file: str = "duplicate_names.db"):
         self.db_file = db_file
-        # allow multi‐threaded access
-        self._lock = threading.Lock()
+        # one long-lived connection shared by all threads, serialized by the
+        # (reentrant) lock; PRAGMAs only need to be applied once
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_file, timeout=10.0, check_same_thread=False,
+                                     cached_statements=256)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA cache_size = -20000;
+        """)
         self._initialize_schema()
+        # read-only connections, one per reading thread, so queries from the
+        # GUI/overlay run alongside the writer instead of queueing on the lock
+        self._tls = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        # write batches through this instance (drives periodic optimize)
+        self._write_gen = 0
+        # query results cached until the next commit by any connection; each
+        # entry remembers the (reader, data_version) it was computed at
+        self._stats_cache: Optional[Tuple[Tuple[int, int], Dict[str, float]]] = None
+        self._dup_cache: Dict[int, Tuple[Tuple[int, int], List[Dict]]] = {}
         logger.info(f"Database initialized at: {self.db_file}")
 
     def _initialize_schema(self):
@@ -46,19 +100,73 @@ class Database:
                     FOREIGN KEY(name_id) REFERENCES seen_names(id)
                 );
             """)
-            # indexes
-            c.execute("CREATE INDEX IF NOT EXISTS idx_seen_names_name ON seen_names(name);")
+            # indexes; seen_names.name is already covered by its UNIQUE
+            # constraint, so a second index on it only slows every write
+            c.execute("DROP INDEX IF EXISTS idx_seen_names_name;")
             c.execute("CREATE INDEX IF NOT EXISTS idx_name_occurrences_name_id ON name_occurrences(name_id);")
+            # covering index for the frequency-ordered listings: rows come out
+            # of an index walk with no temp sort and no table lookups
+            c.execute("""
+                CREATE INDEX IF NOT EXISTS idx_seen_names_freq_lastseen
+                    ON seen_names(total_occurrences DESC, last_seen_ts DESC, name, first_seen_ts);
+            """)
             conn.commit()
 
     @contextmanager
     def _get_connection(self):
-        """Thread‐safe context manager yielding a sqlite3.Connection."""
-        conn = sqlite3.connect(self.db_file, timeout=10.0)
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Thread‐safe context manager yielding the shared sqlite3.Connection."""
+        with self._lock:
+            yield self._conn
+
+    @contextmanager
+    def _read_connection(self):
+        """Context manager yielding this thread's read-only sqlite3.Connection."""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=10.0, check_same_thread=False,
+                                   cached_statements=256)
+            conn.executescript("""
+                PRAGMA query_only = ON;
+                PRAGMA temp_store = MEMORY;
+                PRAGMA mmap_size = 268435456;
+                PRAGMA cache_size = -20000;
+            """)
+            self._tls.conn = conn
+            with self._lock:
+                self._readers.append(conn)
+        yield conn
+
+    def optimize(self) -> None:
+        """Run a bounded ANALYZE on tables whose statistics went stale."""
+        with self._get_connection() as conn:
+            conn.executescript("""
+                PRAGMA analysis_limit = 1000;
+                PRAGMA optimize;
+            """)
+
+    @staticmethod
+    def _cache_key(conn: sqlite3.Connection) -> Tuple[int, int]:
+        """Version key for results read through ``conn``.
+
+        A reader's PRAGMA data_version moves whenever any other connection
+        commits: this instance's writer, another Database on the same file or
+        another process.  The values are per connection, so the key includes
+        the reader.
+        """
+        return id(conn), conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the writer and every per-thread reader connection."""
+        with self._lock:
+            try:
+                self.optimize()
+            except sqlite3.Error as e:
+                logger.warning("PRAGMA optimize failed on close: %s", e)
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+            self._tls = threading.local()
+            self._conn.close()
 
     def record_names(self,
                      names: List[str],
@@ -74,48 +182,77 @@ class Database:
         if counts is None:
             counts = [1] * len(names)
 
+        if not names:
+            return
+
+        # collapse repeats within the batch so each name is written once
+        totals: Dict[str, int] = {}
+        for name, cnt in zip(names, counts):
+            totals[name] = totals.get(name, 0) + cnt
+
         now = time.time()
-        with self._lock, self._get_connection() as conn:
+        with self._get_connection() as conn:
             c = conn.cursor()
-            for name, cnt in zip(names, counts):
-                # upsert into seen_names
-                c.execute("""
-                    SELECT id, total_occurrences
-                      FROM seen_names
-                     WHERE name = ?
-                """, (name,))
-                row = c.fetchone()
-                if row:
-                    name_id, total = row
-                    new_total = total + cnt
-                    c.execute("""
-                        UPDATE seen_names
-                           SET last_seen_ts = ?,
-                               total_occurrences = ?
-                         WHERE id = ?
-                    """, (now, new_total, name_id))
-                else:
-                    c.execute("""
-                        INSERT INTO seen_names
-                            (name, first_seen_ts, last_seen_ts, total_occurrences)
-                        VALUES (?, ?, ?, ?)
-                    """, (name, now, now, cnt))
-                    name_id = c.lastrowid
-
-                # record in name_occurrences
-                c.execute("""
-                    INSERT INTO name_occurrences
-                        (name_id, ts, count, session_id)
-                    VALUES (?, ?, ?, ?)
-                """, (name_id, now, cnt, session_id))
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                # upsert every name into seen_names in one statement batch
+                c.executemany(_SQL_UPSERT_SEEN,
+                              [(name, now, now, cnt) for name, cnt in totals.items()])
+
+                # resolve ids in chunks, then record in name_occurrences; each
+                # IN list is padded to a power of two by repeating a name
+                unique = list(totals)
+                name_ids = {}
+                for start in range(0, len(unique), _ID_LOOKUP_CHUNK):
+                    chunk = unique[start:start + _ID_LOOKUP_CHUNK]
+                    bucket = 1 << (len(chunk) - 1).bit_length()
+                    chunk += chunk[:1] * (bucket - len(chunk))
+                    c.execute(_sql_select_ids(bucket), chunk)
+                    name_ids.update(c.fetchall())
+                c.executemany(_SQL_INSERT_OCCURRENCE,
+                              [(name_ids[name], now, cnt, session_id)
+                               for name, cnt in totals.items()])
+            except Exception:
+                conn.rollback()
+                raise
 
             conn.commit()
+            self._write_gen += 1
+            if self._write_gen % self.OPTIMIZE_EVERY == 0:
+                self.optimize()
+
+    def add_name_occurrence(self,
+                            name: str,
+                            count: int = 1,
+                            session_id: Optional[str] = None) -> None:
+        """Record ``count`` occurrences of a single name."""
+        now = time.time()
+        with self._get_connection() as conn:
+            c = conn.cursor()
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute(_SQL_UPSERT_SEEN_RETURNING, (name, now, now, count))
+                name_id = c.fetchone()[0]
+                c.execute(_SQL_INSERT_OCCURRENCE, (name_id, now, count, session_id))
+            except Exception:
+                conn.rollback()
+                raise
+
+            conn.commit()
+            self._write_gen += 1
+
+    def add_name_occurrences(self,
+                             counts: Dict[str, int],
+                             session_id: Optional[str] = None) -> None:
+        """Record occurrences for many names ({name: count}) in one batch."""
+        if counts:
+            self.record_names(list(counts), list(counts.values()), session_id)
 
     def get_total_count(self, name: str) -> int:
         """Return the total occurrence count for a given name."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             c = conn.cursor()
-            c.execute("SELECT total_occurrences FROM seen_names WHERE name = ?", (name,))
+            c.execute(_SQL_SELECT_TOTAL, (name,))
             row = c.fetchone()
             return row[0] if row else 0
 
@@ -125,7 +262,7 @@ class Database:
         Each record is a dict with keys:
         name, first_seen_ts, last_seen_ts, total_occurrences
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             c = conn.cursor()
             c.execute("""
                 SELECT name, first_seen_ts, last_seen_ts, total_occurrences
@@ -137,7 +274,11 @@ class Database:
 
     def get_duplicates(self, min_occurrences: int = 2) -> List[Dict]:
         """Return only those names seen at least `min_occurrences` times."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
+            key = self._cache_key(conn)
+            cached = self._dup_cache.get(min_occurrences)
+            if cached is not None and cached[0] == key:
+                return list(cached[1])
             c = conn.cursor()
             c.execute("""
                 SELECT name, first_seen_ts, last_seen_ts, total_occurrences
@@ -146,7 +287,9 @@ class Database:
               ORDER BY total_occurrences DESC, last_seen_ts DESC
             """, (min_occurrences,))
             cols = [col[0] for col in c.description]
-            return [dict(zip(cols, row)) for row in c.fetchall()]
+            rows = [dict(zip(cols, row)) for row in c.fetchall()]
+        self._dup_cache[min_occurrences] = (key, rows)
+        return list(rows)
 
     def get_stats(self) -> Dict[str, float]:
         """
@@ -154,8 +297,13 @@ class Database:
         - unique_names
         - total_occurrences
         - duplicates (names with occurrences>1)
+        Cached until the next write.
         """
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
+            key = self._cache_key(conn)
+            cached = self._stats_cache
+            if cached is not None and cached[0] == key:
+                return dict(cached[1])
             c = conn.cursor()
             c.execute("SELECT COUNT(*) FROM seen_names")
             unique_names = c.fetchone()[0]
@@ -163,17 +311,28 @@ class Database:
             total_occ = c.fetchone()[0] or 0
             c.execute("SELECT COUNT(*) FROM seen_names WHERE total_occurrences>1")
             dup_count = c.fetchone()[0]
-            return {
-                "unique_names": unique_names,
-                "total_occurrences": total_occ,
-                "duplicate_names": dup_count
-            }
+        stats = {
+            "unique_names": unique_names,
+            "total_occurrences": total_occ,
+            "duplicate_names": dup_count
+        }
+        self._stats_cache = (key, stats)
+        return dict(stats)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """get_stats() under NameDatabase's keys, as DuplicateTracker expects."""
+        stats = self.get_stats()
+        return {
+            "total_names": stats["unique_names"],
+            "total_occurrences": stats["total_occurrences"]
+        }
 
     def clear_all(self) -> None:
         """Wipe all stored names and occurrences."""
-        with self._lock, self._get_connection() as conn:
+        with self._get_connection() as conn:
             c = conn.cursor()
             c.execute("DELETE FROM name_occurrences")
             c.execute("DELETE FROM seen_names")
             conn.commit()
+            self._write_gen += 1
             logger.info("Cleared all database records")
@@ -3,65 +3,199 @@ Duplicate name tracking and management
 """
 
 import logging
-from typing import List, Dict, Tuple
-from datetime import datetime
-from collections import defaultdict
+import sys
+import time
+from typing import List, Dict, Tuple, Optional, Sequence
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Boxes of the same text within this many pixels are one OCR hit reported twice
+DEDUP_GRID = 8
+
+
+@lru_cache(maxsize=16384)
+def _normalize(name: str) -> str:
+    """Cached strip + lowercase; OCR yields the same names scan after scan.
+
+    Results are interned so every tracker dict keys on the same object.
+    """
+    return sys.intern(name.strip().lower())
+
+
 class DuplicateTracker:
     """Tracks and manages duplicate name detection"""
     
-    def __init__(self, database, overlay):
+    def __init__(self, database, overlay=None, session_id: Optional[str] = None):
         """
         Args:
             database: instance of NameDatabase (with add_name_occurrence, clear_all, get_statistics)
-            overlay: instance of Overlay (with update_markers)
+            overlay: optional instance of Overlay (with update_markers)
+            session_id: optional id stored with every persisted occurrence
+                (for databases whose writes take a session_id)
         """
         self.database = database
         self.overlay = overlay
-        self.session_counts: Dict[str, int] = {}
-        self.session_names = set()  # Names seen in current session
+        self.session_id = session_id
+        self.session_counts: Counter = Counter()  # in-memory counts; DB is write-behind
         self.name_positions = defaultdict(list)  # Track positions of each name
-        self.position_history = {}  # Track position history for scroll adjustment
+        self.position_history: Dict[str, deque] = {}  # Recent positions per name, for scroll adjustment
         self.last_scan_names = set()  # Names from last scan for comparison
+        self._dup_cache = None  # get_duplicate_names() result
+        self._stats_cache = None  # get_statistics() result
+        self._last_boxes_key = None  # boxes last sent to the overlay
+        self._prev_frame_counts: Counter = Counter()  # names in the previous scan
         
         logger.info("DuplicateTracker initialized")
     
+    @property
+    def session_names(self):
+        """Names seen in the current session (a live view of the counts)"""
+        return self.session_counts.keys()
+    
     def process(self, results: List[Dict]) -> None:
         """
         Process OCR results and highlight duplicates.
         
         Args:
-            results: List of dicts with keys: text, bbox (x, y, width, height), confidence
+            results: List of dicts with keys: name, x, y, width, height, confidence
         """
-        duplicate_boxes: List[Tuple[int, int, int, int]] = []
-        
-        # Group results by name
-        name_groups = defaultdict(list)
+        if not results:
+            # Idle frame: nothing to count or persist; clear the markers once
+            self._prev_frame_counts = Counter()
+            if self.overlay is not None and self._last_boxes_key != ():
+                self.overlay.update_markers([])
+                self._last_boxes_key = ()
+            return
+
+        # Drop jittery repeats of the same text at (almost) the same spot
+        seen = set()
+        unique = []
         for entry in results:
-            name = entry['text']
-            name_groups[name].append(entry)
-        
-        # Process each name
-        for name, entries in name_groups.items():
-            # Increment session count
-            count = self.session_counts.get(name, 0) + len(entries)
-            self.session_counts[name] = count
-            
-            # Persist occurrence (insert or update)
-            for entry in entries:
-                self.database.add_name_occurrence(name)
-            
-            # If this is a duplicate (seen > 1), queue for highlighting
-            if count > 1:
-                for entry in entries:
-                    x, y, w, h = entry['bbox']
-                    duplicate_boxes.append((x, y, w, h))
-                logger.info(f"Duplicate detected: '{name}' (session count={count})")
+            key = (entry['name'], entry['x'] // DEDUP_GRID, entry['y'] // DEDUP_GRID)
+            if key not in seen:
+                seen.add(key)
+                unique.append(entry)
+        results = unique
+
+        frame = Counter(entry['name'] for entry in results)
+        delta = self._count_new(frame)
+        
+        # Queue every box of a name seen more than once for highlighting
+        counts = self.session_counts
+        duplicate_boxes: List[Tuple[int, int, int, int]] = [
+            (entry['x'], entry['y'], entry['width'], entry['height'])
+            for entry in results if counts[entry['name']] > 1
+        ]
+        if logger.isEnabledFor(logging.DEBUG):
+            for name in delta:
+                if counts[name] > 1:
+                    logger.debug("Duplicate detected: '%s' (session count=%d)", name, counts[name])
+        if duplicate_boxes:
+            logger.info("Tick: %d duplicates across %d names", len(duplicate_boxes), len(frame))
         
-        # Update overlay: pass empty list to clear markers when no duplicates
-        self.overlay.update_markers(duplicate_boxes)
+        # Update overlay: pass empty list to clear markers when no duplicates,
+        # but only when the marker set actually changed since the last scan
+        key = tuple(sorted(duplicate_boxes))
+        if self.overlay is not None and key != self._last_boxes_key:
+            self.overlay.update_markers(duplicate_boxes)
+            self._last_boxes_key = key
+    
+    def _count_new(self, frame: Counter) -> Counter:
+        """
+        Add a scan's occurrences to the session counts, net of the previous scan.
+
+        Only what is new since the previous scan counts: a name that merely
+        stays on screen is the same occurrence, not a duplicate.
+
+        Returns:
+            The per-name counts that were added
+        """
+        delta = frame - self._prev_frame_counts
+        self._prev_frame_counts = frame
+        if delta:
+            self.session_counts.update(delta)
+            self._invalidate_caches()
+            # Persist this scan's new occurrences in one go
+            self._persist(delta)
+        return delta
+
+    def _invalidate_caches(self) -> None:
+        """Drop cached duplicate list and statistics after counts changed"""
+        self._dup_cache = None
+        self._stats_cache = None
+    
+    def _persist(self, counts: Dict[str, int]) -> None:
+        """Record per-name occurrence counts, in bulk when the DB supports it"""
+        extra = {} if self.session_id is None else {'session_id': self.session_id}
+        bulk = getattr(self.database, 'add_name_occurrences', None)
+        if bulk is not None:
+            bulk(counts, **extra)
+        else:
+            for name, count in counts.items():
+                self.database.add_name_occurrence(name, count, **extra)
+
+    def process_names(self,
+                      names: Sequence,
+                      scroll_info: Optional[Dict] = None,
+                      positions: Optional[Sequence[Tuple[int, int, int, int]]] = None) -> List[Dict]:
+        """
+        Count one scan's names and return the duplicates found so far.
+
+        Args:
+            names: OCR dicts (keys: name, x, y, width, height), or, when
+                ``positions`` is given, the already extracted name strings
+            scroll_info: latest scroll detection result, if any
+            positions: (x, y, width, height) per entry of ``names``
+
+        Returns:
+            List of dicts with keys: name, count, positions
+        """
+        if positions is None:
+            texts = [item['name'] for item in names]
+            positions = [(item['x'], item['y'], item['width'], item['height'])
+                         for item in names]
+        else:
+            texts = names
+
+        if scroll_info:
+            self.adjust_existing_positions(scroll_info)
+
+        # Group this scan's boxes by normalized name, folding each distinct
+        # raw text only once and dropping jittery repeats like process()
+        self.last_scan_names = set(self.name_positions.keys())
+        self.name_positions = defaultdict(list)
+        normalize = self.normalize_name
+        folded = {}
+        seen = set()
+        for text, (x, y, w, h) in zip(texts, positions):
+            name = folded.get(text)
+            if name is None:
+                name = folded[text] = normalize(text)
+            if not name:
+                continue
+            x, y = int(x), int(y)
+            key = (name, x // DEDUP_GRID, y // DEDUP_GRID)
+            if key not in seen:
+                seen.add(key)
+                self.name_positions[name].append(
+                    {'x': x, 'y': y, 'width': int(w), 'height': int(h)})
+
+        self._count_new(Counter({name: len(boxes)
+                                 for name, boxes in self.name_positions.items()}))
+        
+        duplicates = []
+        for name, boxes in self.name_positions.items():
+            count = self.session_counts[name]
+            self.update_position_history(name, boxes)
+
+            if count > 1:
+                duplicates.append({'name': name, 'count': count, 'positions': boxes})
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Duplicate detected: '%s' (session count=%d)", name, count)
+
+        return duplicates
     
     def reset_session(self) -> None:
         """
@@ -69,11 +203,14 @@ class DuplicateTracker:
         Database remains intact.
         """
         self.session_counts.clear()
-        self.session_names.clear()
         self.name_positions.clear()
         self.position_history.clear()
         self.last_scan_names.clear()
-        self.overlay.update_markers([])  # clear all markers
+        self._prev_frame_counts = Counter()
+        self._invalidate_caches()
+        if self.overlay is not None:
+            self.overlay.update_markers([])  # clear all markers
+        self._last_boxes_key = ()
         logger.info("Session counts reset")
     
     def clear_all(self) -> None:
@@ -82,32 +219,38 @@ class DuplicateTracker:
         """
         self.reset_session()
         self.database.clear_all_data()
+        self._invalidate_caches()
         logger.info("All data cleared from session and database")
     
     def get_statistics(self) -> Dict[str, int]:
         """
-        Return statistics combining session and database info:
+        Return statistics combining session and database info (cached
+        until the next scan, reset or clear):
             session_names: distinct names seen this session
             session_occurrences: total occurrences this session
             database_names: total distinct names in DB
             database_occurrences: total occurrences in DB
         """
-        session_names = len(self.session_counts)
-        session_occurrences = sum(self.session_counts.values())
-        db_stats = self.database.get_statistics()
-        
-        return {
-            'session_names': session_names,
-            'session_occurrences': session_occurrences,
-            'database_names': db_stats.get('total_names', 0),
-            'database_occurrences': db_stats.get('total_occurrences', 0)
-        }
+        if self._stats_cache is None:
+            session_names = len(self.session_counts)
+            session_occurrences = sum(self.session_counts.values())
+            db_stats = self.database.get_statistics()
+            
+            self._stats_cache = {
+                'session_names': session_names,
+                'session_occurrences': session_occurrences,
+                'database_names': db_stats.get('total_names', 0),
+                'database_occurrences': db_stats.get('total_occurrences', 0)
+            }
+        return dict(self._stats_cache)
     
     def get_duplicate_names(self) -> List[Tuple[str, int]]:
         """
         List names seen more than once in this session, with their session counts.
         """
-        return [(n, c) for n, c in self.session_counts.items() if c > 1]
+        if self._dup_cache is None:
+            self._dup_cache = [(n, c) for n, c in self.session_counts.items() if c > 1]
+        return list(self._dup_cache)
     
     def update_position_history(self, normalized_name: str, positions: List[Dict]) -> None:
         """Update position history for a name
@@ -116,23 +259,21 @@ class DuplicateTracker:
             normalized_name: Normalized name string
             positions: List of position dictionaries
         """
-        if normalized_name not in self.position_history:
-            self.position_history[normalized_name] = []
-        
-        # Add current positions with timestamp
-        timestamp = datetime.now()
-        for pos in positions:
-            self.position_history[normalized_name].append({
-                'x': pos['x'],
-                'y': pos['y'],
-                'width': pos['width'],
-                'height': pos['height'],
-                'timestamp': timestamp
-            })
-        
-        # Keep only recent positions (last 10)
-        if len(self.position_history[normalized_name]) > 10:
-            self.position_history[normalized_name] = self.position_history[normalized_name][-10:]
+        history = self.position_history.get(normalized_name)
+        if history is None:
+            # Keep only recent positions (last 10); older ones fall off the left
+            history = self.position_history[normalized_name] = deque(maxlen=10)
+        
+        # Add current positions with a monotonic timestamp (ns); only their
+        # relative order matters
+        timestamp = time.monotonic_ns()
+        history.extend({
+            'x': pos['x'],
+            'y': pos['y'],
+            'width': pos['width'],
+            'height': pos['height'],
+            'timestamp': timestamp
+        } for pos in positions)
     
     def adjust_existing_positions(self, scroll_info: Dict) -> None:
         """Adjust existing marker positions based on scroll
@@ -142,15 +283,21 @@ class DuplicateTracker:
         """
         direction = scroll_info['direction']
         magnitude = scroll_info['magnitude']
+        # Resolve the direction once instead of per position
+        if direction == 'down':
+            dy = -magnitude
+        elif direction == 'up':
+            dy = magnitude
+        else:
+            dy = 0
+        if not dy:
+            return
         
-        for name, positions in self.position_history.items():
+        for positions in self.position_history.values():
             for pos in positions:
-                if direction == 'down':
-                    pos['y'] -= magnitude
-                elif direction == 'up':
-                    pos['y'] += magnitude
+                pos['y'] += dy
         
-        logger.debug(f"Adjusted positions for {len(self.position_history)} names")
+        logger.debug("Adjusted positions for %d names", len(self.position_history))
     
     def get_names_scrolled_out(self, region_height: int) -> set:
         """Get names that have scrolled out of view
@@ -204,4 +351,4 @@ class DuplicateTracker:
             Normalized name string
         """
         # Basic normalization: strip whitespace, convert to lowercase
-        return name.strip().lower()
+        return _normalize(name)
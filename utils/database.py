@@ -2,16 +2,64 @@
 Database module for persisting duplicate name tracking data
 """
 
+import hashlib
 import logging
 import sqlite3
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Hot statements as module constants: the connection's statement cache is
+# keyed by the SQL text, so identical strings skip re-preparing
+_SQL_UPSERT = (
+    "INSERT INTO SeenNames (name, count) VALUES (?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET count = count + excluded.count"
+)
+_SQL_UPSERT_RETURNING = _SQL_UPSERT + " RETURNING count"
+_SQL_GET_COUNT = "SELECT count FROM SeenNames WHERE name = ?"
+_SQL_STATS_AGG = "SELECT COUNT(*), SUM(count) FROM SeenNames"
+_SQL_STATS_TOP = "SELECT name, count FROM SeenNames ORDER BY count DESC LIMIT 10"
+
+
+class _BloomFilter:
+    """Fixed-size Bloom filter answering 'definitely not seen' for names"""
+
+    def __init__(self, num_bits: int = 1 << 23, num_hashes: int = 7):
+        self.num_bits = num_bits  # must be a power of two
+        self.num_hashes = num_hashes
+        self.bits = bytearray(num_bits // 8)
+
+    def _positions(self, name: str):
+        digest = hashlib.blake2b(name.encode('utf-8'), digest_size=4 * self.num_hashes).digest()
+        mask = self.num_bits - 1
+        for i in range(0, len(digest), 4):
+            yield int.from_bytes(digest[i:i + 4], 'little') & mask
+
+    def add(self, name: str) -> None:
+        bits = self.bits
+        for pos in self._positions(name):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, name: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(name))
+
+    def clear(self) -> None:
+        self.bits = bytearray(len(self.bits))
+
+
 class NameDatabase:
     """SQLite database for tracking seen names and their counts"""
 
+    COUNT_CACHE_SIZE = 4096
+    # seconds between checks for commits by other connections; cached
+    # lookups in between answer without touching SQLite
+    SYNC_INTERVAL = 1.0
+
     def __init__(self, db_path: Path = None):
         if db_path is None:
             # Default to a database file in the project root
@@ -19,24 +67,83 @@ class NameDatabase:
         self.db_path = Path(db_path)
         # Ensure parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # one long-lived connection, serialized across threads by the lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                     cached_statements=256)
+        self._conn.executescript("""
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -20000;
+        """)
         self._init_database()
+        self._stats_cache = None  # get_statistics() result, dropped on writes
+        self._count_cache: OrderedDict = OrderedDict()  # LRU of name -> count
+        # in-memory front for lookups: names not in the filter were never
+        # stored by this connection; writes from other connections are
+        # picked up through PRAGMA data_version (see _sync_external_writes)
+        self._bloom = _BloomFilter()
+        self._data_version = None
+        self._synced_at = float('-inf')  # time.monotonic() of the last data_version check
+        with self._connect() as conn:
+            self._sync_external_writes(conn)
         logger.info(f"Database initialized at: {self.db_path}")
 
+    @contextmanager
+    def _connect(self):
+        """Yield the shared connection inside a commit-or-rollback block."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def _sync_external_writes(self, conn) -> None:
+        """Rebuild in-memory state if another connection committed since the last check.
+
+        Checked at most once per SYNC_INTERVAL, so other connections' writes
+        show up within that window. data_version only moves for commits made
+        by *other* connections, so this instance's own writes never trigger
+        a rebuild. A rebuild re-reads every name in SeenNames (O(N)); another
+        writer can also delete rows, so names can't just be added in place.
+        """
+        now = time.monotonic()
+        if now - self._synced_at < self.SYNC_INTERVAL:
+            return
+        self._synced_at = now
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return
+        self._data_version = version
+        self._bloom.clear()
+        for (name,) in conn.execute("SELECT name FROM SeenNames"):
+            self._bloom.add(name)
+        self._count_cache.clear()
+        self._stats_cache = None
+
+    def close(self):
+        """Close the shared connection."""
+        with self._lock:
+            self._conn.close()
+
     def _init_database(self):
         """Initialize the database with required tables and PRAGMAs."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 # Use Write-Ahead Logging for better concurrency and performance
                 cursor.execute("PRAGMA journal_mode = WAL;")
-                # Create the SeenNames table
+                # Create the SeenNames table; keyed by name only, so store
+                # rows directly in the primary-key B-tree (no rowid lookup)
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS SeenNames (
                         name TEXT PRIMARY KEY,
                         first_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         count INTEGER NOT NULL
-                    )
+                    ) WITHOUT ROWID
                 """)
+                # top-N by count walks this index instead of sorting the
+                # table; the name primary key rides along, so it covers
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_seen_names_count ON SeenNames(count DESC)"
+                )
                 conn.commit()
                 logger.info("Database tables initialized (WAL mode enabled)")
         except Exception as e:
@@ -46,41 +153,72 @@ class NameDatabase:
     def get_count(self, name: str) -> int:
         """Get the current count for a specific name, or 0 if not present."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                self._sync_external_writes(conn)
+                if name not in self._bloom:
+                    return 0
+                cache = self._count_cache
+                if name in cache:
+                    cache.move_to_end(name)
+                    return cache[name]
                 cursor = conn.cursor()
-                cursor.execute("SELECT count FROM SeenNames WHERE name = ?", (name,))
+                cursor.execute(_SQL_GET_COUNT, (name,))
                 row = cursor.fetchone()
-                return row[0] if row else 0
+                count = row[0] if row else 0
+                self._cache_count(name, count)
+                return count
         except Exception as e:
             logger.error(f"Error fetching count for '{name}': {e}")
             return 0
 
-    def add_name_occurrence(self, name: str, occurrences: int = 1):
+    def _cache_count(self, name: str, count: int) -> None:
+        """Store a known count in the LRU, evicting the oldest entry if full."""
+        cache = self._count_cache
+        cache[name] = count
+        cache.move_to_end(name)
+        if len(cache) > self.COUNT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def add_name_occurrence(self, name: str, occurrences: int = 1) -> int:
         """
         Record one or more occurrences of a name:
          - if new, insert with count=occurrences
          - if exists, increment count by occurrences
+        Returns the name's new count (0 on error), so callers can tell a
+        duplicate (count > 1) without a second query.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT count FROM SeenNames WHERE name = ?", (name,))
-                row = cursor.fetchone()
-                if row:
-                    cursor.execute(
-                        "UPDATE SeenNames SET count = count + ? WHERE name = ?",
-                        (occurrences, name)
-                    )
-                    logger.debug(f"Incremented '{name}' by {occurrences}")
-                else:
-                    cursor.execute(
-                        "INSERT INTO SeenNames (name, count) VALUES (?, ?)",
-                        (name, occurrences)
-                    )
-                    logger.debug(f"Inserted '{name}' with count {occurrences}")
-                conn.commit()
+            with self._connect() as conn:
+                cursor = conn.execute(_SQL_UPSERT_RETURNING, (name, occurrences))
+                count = cursor.fetchone()[0]
+                cursor.close()
+                self._bloom.add(name)
+                self._cache_count(name, count)
+                self._stats_cache = None
+                logger.debug("Recorded '%s' (+%d, count=%d)", name, occurrences, count)
+                return count
         except Exception as e:
             logger.error(f"Error adding occurrence for '{name}': {e}")
+            return 0
+
+    def add_name_occurrences(self, counts: dict):
+        """
+        Record occurrences for many names at once ({name: occurrences}),
+        in a single transaction.
+        """
+        if not counts:
+            return
+        try:
+            with self._connect() as conn:
+                conn.executemany(_SQL_UPSERT, counts.items())
+                conn.commit()
+                for name in counts:
+                    self._bloom.add(name)
+                    self._count_cache.pop(name, None)
+                self._stats_cache = None
+                logger.debug("Recorded occurrences for %d names", len(counts))
+        except Exception as e:
+            logger.error(f"Error adding occurrences for {len(counts)} names: {e}")
 
     def get_statistics(self) -> dict:
         """
@@ -88,25 +226,29 @@ class NameDatabase:
          - total_names: number of distinct names
          - total_occurrences: sum of all counts
          - top_names: list of top 10 (name, count) tuples
+        The result is cached until the next write.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                self._sync_external_writes(conn)
+                if self._stats_cache is not None:
+                    stats = self._stats_cache
+                    return dict(stats, top_names=list(stats['top_names']))
                 cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*), SUM(count) FROM SeenNames")
+                cursor.execute(_SQL_STATS_AGG)
                 total_names, total_occurrences = cursor.fetchone()
                 total_names = total_names or 0
                 total_occurrences = total_occurrences or 0
 
-                cursor.execute(
-                    "SELECT name, count FROM SeenNames ORDER BY count DESC LIMIT 10"
-                )
+                cursor.execute(_SQL_STATS_TOP)
                 top_names = cursor.fetchall()
 
-                return {
+                self._stats_cache = {
                     'total_names': total_names,
                     'total_occurrences': total_occurrences,
                     'top_names': top_names
                 }
+                return dict(self._stats_cache, top_names=list(top_names))
         except Exception as e:
             logger.error(f"Error fetching statistics: {e}")
             return {'total_names': 0, 'total_occurrences': 0, 'top_names': []}
@@ -117,7 +259,7 @@ class NameDatabase:
         Each entry is (name, count, first_seen).
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT name, count, first_seen FROM SeenNames "
@@ -132,10 +274,13 @@ class NameDatabase:
     def clear_all(self):
         """Delete all records from the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute("DELETE FROM SeenNames")
                 conn.commit()
+                self._bloom.clear()
+                self._count_cache.clear()
+                self._stats_cache = None
                 logger.info("All records cleared from database")
         except Exception as e:
             logger.error(f"Error clearing database: {e}")
@@ -3,11 +3,75 @@ Image processing utilities for the duplicate name highlighter
 """
 
 import logging
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps, ImageChops
+import cv2
+from PIL import Image, ImageFilter
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Contrast factor for debug snapshots
+_DEBUG_CONTRAST = 2.0
+
+# OpenCV treats the last axis as channels; its filters accept up to 512 in
+# 4.x but only 128 in 5.x, so stack no more than that
+_MAX_BATCH_CHANNELS = 128
+
+
+def _to_gray(image):
+    """Return image in 'L' mode, converting only when needed"""
+    return image if image.mode == 'L' else image.convert('L')
+
+
+def _contrast_lut(gray, factor):
+    """256-entry LUT for ImageEnhance.Contrast(factor) on an 'L' image:
+    stretch around the image's rounded mean grey, from its histogram"""
+    hist = np.asarray(gray.histogram(), dtype=np.float64)
+    mean = int(hist @ np.arange(256) / max(hist.sum(), 1) + 0.5)
+    return np.clip(mean + factor * (np.arange(256) - mean), 0, 255).astype(np.uint8).tolist()
+
+
+# 3x3 kernel of PIL's ImageFilter.SMOOTH, which ImageEnhance.Sharpness blends against
+_SMOOTH_KERNEL = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]], np.float32) / 13
+
+
+def _unsharp(arr):
+    """Sharpen for text clarity, matching PIL's Sharpness(1.2) followed by
+    UnsharpMask(radius=1, percent=150, threshold=2) (saturating uint8 math)"""
+    smooth = cv2.filter2D(arr, -1, _SMOOTH_KERNEL, borderType=cv2.BORDER_REPLICATE)
+    arr = cv2.addWeighted(arr, 1.2, smooth.reshape(arr.shape), -0.2, 0)
+    blur = cv2.GaussianBlur(arr, (0, 0), 1.0).reshape(arr.shape)
+    sharp = cv2.addWeighted(arr, 2.5, blur, -1.5, 0)
+    # like UnsharpMask's threshold: leave pixels within 2 levels of the blur
+    return np.where(cv2.absdiff(arr, blur).reshape(arr.shape) >= 2, sharp, arr)
+
+
+def _auto_level_lut(arr):
+    """256-entry auto-level LUT for a uint8 grayscale array (1% cutoff at each end)"""
+    cdf = np.cumsum(np.bincount(arr.ravel(), minlength=256))
+    cut = cdf[-1] * 0.01
+    low = int(np.searchsorted(cdf, cut, side='right'))
+    high = int(np.searchsorted(cdf, cdf[-1] - cut, side='left'))
+    if high <= low:
+        return None
+    return np.clip((np.arange(256) - low) * (255.0 / (high - low)), 0, 255).astype(np.uint8)
+
+
+def _auto_level(arr):
+    """Auto-level a uint8 grayscale array in place with a 1% cutoff at each end"""
+    lut = _auto_level_lut(arr)
+    if lut is not None:
+        cv2.LUT(arr, lut, dst=arr)
+    return arr
+
+
+def fast_phash(gray):
+    """64-bit perceptual hash of a uint8 grayscale array, packed into an int:
+    32x32 area resample, DCT, low 8x8 compared to their median"""
+    arr = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+    low = cv2.dct(arr)[:8, :8].ravel()
+    return int.from_bytes(np.packbits(low > np.median(low[1:])).tobytes(), 'big')
+
+
 class ImageUtils:
     """Utility functions for image processing"""
     
@@ -26,28 +90,80 @@ class ImageUtils:
                 return None
             
             # Convert to grayscale if not already
-            if image.mode != 'L':
-                image = image.convert('L')
+            arr = np.asarray(_to_gray(image))
             
-            # Increase contrast
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(1.5)
+            return Image.fromarray(_auto_level(_unsharp(arr)))
             
-            # Increase sharpness
-            enhancer = ImageEnhance.Sharpness(image)
-            image = enhancer.enhance(1.2)
+        except Exception as e:
+            logger.error(f"Error enhancing image for OCR: {str(e)}")
+            return image  # Return original on error
+    
+    @staticmethod
+    def enhance_and_threshold(image, threshold=128):
+        """Enhance for OCR and binarize in one pass over the pixels
+        
+        Equivalent to apply_threshold(enhance_for_ocr(image), threshold), but
+        the auto-level and threshold lookups are composed into a single LUT.
+        
+        Args:
+            image: PIL Image object
+            threshold: Threshold value (0-255) applied after enhancement
             
-            # Apply unsharp mask for better text clarity
-            image = image.filter(ImageFilter.UnsharpMask(radius=1, percent=150, threshold=2))
+        Returns:
+            Thresholded PIL Image object
+        """
+        try:
+            if image is None:
+                return None
             
-            # Auto-level to improve contrast
-            image = ImageOps.autocontrast(image, cutoff=1)
+            sharp = _unsharp(np.asarray(_to_gray(image)))
+            levels = _auto_level_lut(sharp)
+            if levels is None:
+                levels = np.arange(256)
+            lut = np.where(levels > threshold, 255, 0).astype(np.uint8).tolist()
             
+            return Image.fromarray(sharp).point(lut, mode='1')
+            
+        except Exception as e:
+            logger.error(f"Error enhancing and thresholding image: {str(e)}")
             return image
+    
+    @staticmethod
+    def enhance_for_ocr_batch(images):
+        """Enhance several images for OCR in as few filter calls as possible
+        
+        Same-sized images are stacked along the channel axis so the unsharp
+        mask runs once per group over a single contiguous buffer.
+        
+        Args:
+            images: List of PIL Image objects
+            
+        Returns:
+            List of enhanced PIL Image objects (None entries are kept as None)
+        """
+        results = list(images)
+        try:
+            groups = {}
+            for idx, image in enumerate(images):
+                if image is not None:
+                    groups.setdefault(image.size, []).append(idx)
+            
+            for indices in groups.values():
+                for start in range(0, len(indices), _MAX_BATCH_CHANNELS):
+                    chunk = indices[start:start + _MAX_BATCH_CHANNELS]
+                    stack = np.stack([
+                        np.asarray(_to_gray(images[i])) for i in chunk
+                    ], axis=-1)
+                    sharp = _unsharp(stack).reshape(stack.shape)
+                    for k, i in enumerate(chunk):
+                        plane = np.ascontiguousarray(sharp[..., k])
+                        results[i] = Image.fromarray(_auto_level(plane))
+            
+            return results
             
         except Exception as e:
-            logger.error(f"Error enhancing image for OCR: {str(e)}")
-            return image  # Return original on error
+            logger.error(f"Error enhancing image batch for OCR: {str(e)}")
+            return list(images)
     
     @staticmethod
     def resize_for_ocr(image, min_width=300, min_height=100):
@@ -99,20 +215,13 @@ class ImageUtils:
             if image is None:
                 return None
             
-            # Convert to numpy array for processing
-            img_array = np.array(image)
-            
-            # Apply median filter to reduce noise
-            from scipy import ndimage
-            denoised_array = ndimage.median_filter(img_array, size=2)
+            # Median filter to reduce noise (OpenCV handles L/RGB/RGBA directly)
+            denoised_array = cv2.medianBlur(np.asarray(image), 3)
             
-            # Convert back to PIL Image
-            denoised_image = Image.fromarray(denoised_array.astype('uint8'))
+            return Image.fromarray(denoised_array)
             
-            return denoised_image
-            
-        except ImportError:
-            # Fall back to PIL filters if scipy not available
+        except cv2.error:
+            # Fall back to PIL for modes OpenCV does not accept (e.g. '1', 'I')
             return image.filter(ImageFilter.MedianFilter(size=3))
         except Exception as e:
             logger.error(f"Error denoising image: {str(e)}")
@@ -134,14 +243,12 @@ class ImageUtils:
                 return None
             
             # Convert to grayscale
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # Apply threshold
-            def threshold_func(pixel):
-                return 255 if pixel > threshold else 0
+            image = _to_gray(image)
             
-            thresholded = image.point(threshold_func, mode='1')
+            # Apply threshold through a 256-entry lookup table
+            cut = min(max(int(threshold), -1), 255) + 1
+            lut = [0] * cut + [255] * (256 - cut)
+            thresholded = image.point(lut, mode='1')
             
             return thresholded
             
@@ -164,22 +271,18 @@ class ImageUtils:
                 return {}
             
             # Convert to grayscale for analysis
-            if image.mode != 'L':
-                gray_image = image.convert('L')
-            else:
-                gray_image = image
+            gray_image = _to_gray(image)
             
             # Get histogram
-            histogram = gray_image.histogram()
+            histogram = np.bincount(np.asarray(gray_image, dtype=np.uint8).ravel(), minlength=256)
             
             # Calculate statistics
-            total_pixels = sum(histogram)
-            weighted_sum = sum(i * count for i, count in enumerate(histogram))
+            total_pixels = int(histogram.sum())
+            weighted_sum = int(np.arange(256) @ histogram)
             mean_brightness = weighted_sum / total_pixels if total_pixels > 0 else 0
             
             # Find min and max brightness
-            min_brightness = next(i for i, count in enumerate(histogram) if count > 0)
-            max_brightness = next(255 - i for i, count in enumerate(reversed(histogram)) if count > 0)
+            min_brightness, max_brightness = gray_image.getextrema()
             
             return {
                 'width': image.width,
@@ -210,31 +313,26 @@ class ImageUtils:
             if image1 is None or image2 is None:
                 return 0.0
             
+            # Convert to same mode first so any resize works on fewer channels
+            if image1.mode != image2.mode:
+                image1 = _to_gray(image1)
+                image2 = _to_gray(image2)
+            
             # Ensure images are same size
             if image1.size != image2.size:
                 # Resize to match smaller image
                 min_width = min(image1.width, image2.width)
                 min_height = min(image1.height, image2.height)
-                image1 = image1.resize((min_width, min_height), Image.LANCZOS)
-                image2 = image2.resize((min_width, min_height), Image.LANCZOS)
-            
-            # Convert to same mode
-            if image1.mode != image2.mode:
-                if image1.mode != 'L':
-                    image1 = image1.convert('L')
-                if image2.mode != 'L':
-                    image2 = image2.convert('L')
+                # reducing_gap box-reduces large ratios before the Lanczos pass
+                image1 = image1.resize((min_width, min_height), Image.LANCZOS, reducing_gap=2.0)
+                image2 = image2.resize((min_width, min_height), Image.LANCZOS, reducing_gap=2.0)
             
-            # Calculate difference
-            diff = ImageChops.difference(image1, image2)
-            
-            # Get histogram of differences
-            histogram = diff.histogram()
-            
-            # Calculate similarity (inverse of average difference)
-            total_pixels = sum(histogram)
-            weighted_diff = sum(i * count for i, count in enumerate(histogram))
-            avg_diff = weighted_diff / total_pixels if total_pixels > 0 else 0
+            # Mean absolute difference in a single pass
+            a = np.asarray(image1, dtype=np.int16)
+            b = np.asarray(image2, dtype=np.int16)
+            diff = np.subtract(a, b)
+            np.abs(diff, out=diff)
+            avg_diff = float(diff.mean()) if diff.size else 0
             
             # Convert to similarity score (0-1)
             similarity = 1.0 - (avg_diff / 255.0)
@@ -261,10 +359,7 @@ class ImageUtils:
                 return None
             
             # Convert to grayscale for analysis
-            if image.mode != 'L':
-                gray_image = image.convert('L')
-            else:
-                gray_image = image
+            gray_image = _to_gray(image)
             
             # Find bounding box of non-white content
             bbox = gray_image.getbbox()
@@ -291,12 +386,13 @@ class ImageUtils:
             return image
     
     @staticmethod
-    def create_thumbnail(image, size=(150, 150)):
+    def create_thumbnail(image, size=(150, 150), inplace=False):
         """Create thumbnail of image
         
         Args:
             image: PIL Image object
             size: Tuple of (width, height) for thumbnail
+            inplace: Shrink the given image instead of a copy of it
             
         Returns:
             Thumbnail PIL Image object
@@ -305,8 +401,10 @@ class ImageUtils:
             if image is None:
                 return None
             
-            # Create thumbnail while preserving aspect ratio
-            thumbnail = image.copy()
+            thumbnail = image if inplace else image.copy()
+            
+            # Lanczos while preserving aspect ratio; thumbnail() already
+            # box-reduces large ratios first (reducing_gap=2.0)
             thumbnail.thumbnail(size, Image.LANCZOS)
             
             return thumbnail
@@ -331,15 +429,14 @@ class ImageUtils:
             if image is None:
                 return False
             
-            debug_image = image.copy()
+            debug_image = image
             
             if enhance_for_debug:
-                # Enhance contrast for better visibility
-                if debug_image.mode != 'L':
-                    debug_image = debug_image.convert('L')
-                
-                enhancer = ImageEnhance.Contrast(debug_image)
-                debug_image = enhancer.enhance(2.0)
+                # Enhance contrast for better visibility, like
+                # ImageEnhance.Contrast but in one point() pass (which
+                # returns a new image)
+                debug_image = _to_gray(debug_image)
+                debug_image = debug_image.point(_contrast_lut(debug_image, _DEBUG_CONTRAST))
             
             debug_image.save(filename)
             logger.debug(f"Debug image saved: {filename}")